@@ -1,18 +1,75 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objs as go
-from plotly.subplots import make_subplots
+import ccxt
 import time
 import os
 import sys
 import types
 import json
+import base64
+import string
+import hashlib
 from datetime import datetime, timedelta
-from indicators.rsi import rsi
+from indicators.rsi import rsi, rsi_ema_multi
 from indicators.stoch import stochastic
 from indicators.parabolic_sar import parabolic_sar
 from utils.chart_builder import create_premium_chart, get_chart_config
 
+_BALANCE_CARD = string.Template("""
+<div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
+            border: 1px solid var(--border-color); margin: 1rem 0;">
+    <div style="text-align: center; margin-bottom: 1rem;">
+        <h4 style="margin: 0; color: var(--text-primary); display: flex; align-items: center; 
+                   justify-content: center; gap: 0.5rem;">
+            $title
+        </h4>
+    </div>
+    <div style="text-align: center; margin-bottom: 1rem;">
+        <div style="font-size: $headline_size; font-weight: 700; color: $headline_color;">
+            $headline
+        </div>
+        <div style="font-size: 0.9rem; color: var(--text-secondary);">$caption</div>
+    </div>
+    $body
+</div>
+""")
+
+_BALANCE_ROW = string.Template("""
+        <div style="display: flex; justify-content: space-between;">
+            <span style="color: var(--text-secondary);">$label:</span>
+            <span style="color: $color; font-weight: 600;">$$$value</span>
+        </div>""")
+
+_BALANCE_LOADING_BODY = """<div style="text-align: center;">
+        <div style="color: var(--text-secondary); font-size: 0.8rem;">
+            Balance will appear automatically when connected
+        </div>
+    </div>"""
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _render_balance(title: str, accent: str, headline: float = None, caption: str = "",
+                    rows: tuple = ()) -> str:
+    """
+    Render the balance card HTML; identical balances are served from cache.
+    rows is a tuple of (label, color, value); headline None renders the loading state.
+    """
+    if headline is None:
+        return _BALANCE_CARD.substitute(
+            title=title, headline_size="1.5rem", headline_color="var(--text-secondary)",
+            headline="Loading...", caption=caption, body=_BALANCE_LOADING_BODY
+        )
+    body = '<div style="display: grid; gap: 0.5rem;">' + "".join(
+        _BALANCE_ROW.substitute(label=label, color=color, value=f"{value:,.2f}") for label, color, value in rows
+    ) + "\n    </div>"
+    return _BALANCE_CARD.substitute(
+        title=title, headline_size="2rem", headline_color=accent,
+        headline=f"${headline:,.2f}", caption=caption, body=body
+    )
+
+
 def display_account_balance(paper_mode: bool, real_account_data: dict = None):
     """
     Consolidated function to display account balance information
@@ -20,129 +77,1110 @@ def display_account_balance(paper_mode: bool, real_account_data: dict = None):
     """
     if not paper_mode and real_account_data and real_account_data.get('balance'):
         # Real account data
-        real_balance = real_account_data['balance']
-        usdt_balance = real_balance.get('USDT', {})
+        usdt_balance = real_account_data['balance'].get('USDT', {})
         real_cash = usdt_balance.get('free', 0)
-        real_total = usdt_balance.get('total', 0)
-        real_used = usdt_balance.get('used', 0)
-        
-        return f"""
-        <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
-                    border: 1px solid var(--border-color); margin: 1rem 0;">
-            <div style="text-align: center; margin-bottom: 1rem;">
-                <h4 style="margin: 0; color: var(--text-primary); display: flex; align-items: center; 
-                           justify-content: center; gap: 0.5rem;">
-                    💰 Real Account Balance
-                </h4>
-            </div>
-            <div style="text-align: center; margin-bottom: 1rem;">
-                <div style="font-size: 2rem; font-weight: 700; color: var(--accent-green);">
-                    ${real_cash:,.2f}
-                </div>
-                <div style="font-size: 0.9rem; color: var(--text-secondary);">Total Balance</div>
-            </div>
-            <div style="display: grid; gap: 0.5rem;">
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Available:</span>
-                    <span style="color: var(--accent-green); font-weight: 600;">${real_cash:,.2f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">In Orders:</span>
-                    <span style="color: var(--accent-blue); font-weight: 600;">${real_used:,.2f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Total:</span>
-                    <span style="color: var(--text-primary); font-weight: 600;">${real_total:,.2f}</span>
-                </div>
-            </div>
-        </div>
-        """
+        return _render_balance("💰 Real Account Balance", "var(--accent-green)", real_cash, "Total Balance", (
+            ("Available", "var(--accent-green)", real_cash),
+            ("In Orders", "var(--accent-blue)", usdt_balance.get('used', 0)),
+            ("Total", "var(--text-primary)", usdt_balance.get('total', 0)),
+        ))
     elif not paper_mode:
         # Real trading mode but no account data yet
-        return f"""
-        <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
-                    border: 1px solid var(--border-color); margin: 1rem 0;">
-            <div style="text-align: center; margin-bottom: 1rem;">
-                <h4 style="margin: 0; color: var(--text-primary); display: flex; align-items: center; 
-                           justify-content: center; gap: 0.5rem;">
-                    💰 Real Account Balance
-                </h4>
-            </div>
-            <div style="text-align: center; margin-bottom: 1rem;">
-                <div style="font-size: 1.5rem; font-weight: 700; color: var(--text-secondary);">
-                    Loading...
-                </div>
-                <div style="font-size: 0.9rem; color: var(--text-secondary);">Connecting to exchange</div>
-            </div>
-            <div style="text-align: center;">
-                <div style="color: var(--text-secondary); font-size: 0.8rem;">
-                    Balance will appear automatically when connected
-                </div>
-            </div>
-        </div>
-        """
+        return _render_balance("💰 Real Account Balance", "var(--text-secondary)", caption="Connecting to exchange")
     else:
         # Paper trading mode
         account = st.session_state.get('account', {'cash': 10000, 'equity': [10000]})
         paper_cash = account.get('cash', 10000)
-        paper_equity = account.get('equity', [10000])[-1] if account.get('equity') else 10000
-        
-        return f"""
-        <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
-                    border: 1px solid var(--border-color); margin: 1rem 0;">
-            <div style="text-align: center; margin-bottom: 1rem;">
-                <h4 style="margin: 0; color: var(--text-primary); display: flex; align-items: center; 
-                           justify-content: center; gap: 0.5rem;">
-                    📊 Paper Account Balance
-                </h4>
-            </div>
-            <div style="text-align: center; margin-bottom: 1rem;">
-                <div style="font-size: 2rem; font-weight: 700; color: var(--accent-blue);">
-                    ${paper_equity:,.2f}
-                </div>
-                <div style="font-size: 0.9rem; color: var(--text-secondary);">Paper Trading Balance</div>
-            </div>
-            <div style="display: grid; gap: 0.5rem;">
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Available Cash:</span>
-                    <span style="color: var(--accent-blue); font-weight: 600;">${paper_cash:,.2f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Total Equity:</span>
-                    <span style="color: var(--text-primary); font-weight: 600;">${paper_equity:,.2f}</span>
-                </div>
-            </div>
-        </div>
-        """
+        equity = equity_history(account)
+        paper_equity = float(equity[-1]) if len(equity) else 10000
+        return _render_balance("📊 Paper Account Balance", "var(--accent-blue)", paper_equity, "Paper Trading Balance", (
+            ("Available Cash", "var(--accent-blue)", paper_cash),
+            ("Total Equity", "var(--text-primary)", paper_equity),
+        ))
 from indicators.wavetrend import wavetrend
+from indicators.weighted_signals import generate_weighted_signals
 from signals.engine import align_signals
 from backtester.core import run_backtest
-from utils.logger import log_trade, log_pnl
+from utils.logger import log_trade, log_pnl, flush_pnl
 from utils.error_handler import error_handler, safe_execute, TradingError, APIError
 from executor.ccxt_executor import CCXTExecutor
-from strategies.manager import StrategyManager
-from utils.risk import position_size_from_risk
-from arbitrage.engine import ArbitrageEngine
-from utils.configurable_risk import ConfigurableRiskManager, StopLossType
-from backtester.enhanced_backtester import EnhancedBacktester
-from backtester.comprehensive_metrics import ComprehensiveMetricsCalculator
-from backtester.multi_timeframe_analyzer import MultiTimeframeAnalyzer
-from signals.trading_triggers import TradingTriggerEngine
-from indicators.weighted_signals import WeightedSignalGenerator
+from utils.risk import exit_levels, position_size_from_risk, should_exit_position
 from utils.tv_signals import load_tradingview_signals, fetch_recent_signals_http
 from utils.tv_mapper import to_yfinance_symbol
+from utils import disk_cache
+from utils.cards import signal_card_html, arb_opportunity_html
+
+
+# Heavy modules below are imported on first use only, so a cold start (and any
+# session that never opens the related feature) skips their import cost. Later
+# calls are cheap because the import statement finds the module in sys.modules.
+def _yf():
+    """yfinance, forced onto standard requests (avoid curl_cffi impersonate)."""
+    if 'yfinance' in sys.modules:
+        return sys.modules['yfinance']
+    os.environ.setdefault("YFINANCE_DISABLE_CURL_CFFI", "1")
+    try:
+        import requests as _pyrequests
+        _shim = types.ModuleType('curl_cffi')
+        _shim.requests = _pyrequests
+        sys.modules['curl_cffi'] = _shim
+    except Exception:
+        pass
+    import yfinance
+    return yfinance
+
+
+def _EnhancedBacktester():
+    from backtester.enhanced_backtester import EnhancedBacktester
+    return EnhancedBacktester
+
+
+def _ComprehensiveMetricsCalculator():
+    from backtester.comprehensive_metrics import ComprehensiveMetricsCalculator
+    return ComprehensiveMetricsCalculator
+
+
+def _MultiTimeframeAnalyzer():
+    from backtester.multi_timeframe_analyzer import MultiTimeframeAnalyzer
+    return MultiTimeframeAnalyzer
+
+
+def _StrategyManager():
+    from strategies.manager import StrategyManager
+    return StrategyManager
+
+
+def _TradingTriggerEngine():
+    from signals.trading_triggers import TradingTriggerEngine
+    return TradingTriggerEngine
+
+
+def _ArbitrageEngine():
+    from arbitrage.engine import ArbitrageEngine
+    return ArbitrageEngine
+
+
+# Optional browser-side refresh timer; without it the app falls back to server-side reruns
+try:
+    from streamlit_autorefresh import st_autorefresh
+except ImportError:
+    st_autorefresh = None
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor(ex_name: str, paper: bool, _api_key: str = None, _api_secret: str = None,
+                 _passphrase: str = None) -> CCXTExecutor:
+    """
+    Build the exchange executor once per (exchange, mode) and reuse it across reruns.
+    Credentials are fixed per exchange (read from .env), so they are left out of the
+    cache key instead of being hashed.
+    """
+    executor = CCXTExecutor(ex_name, _api_key, _api_secret, paper=paper)
+    if _passphrase and hasattr(executor.ex, 'options'):
+        # Coinbase requires the passphrase in the exchange options
+        executor.ex.options['passphrase'] = _passphrase
+    return executor
+
+
+# Public (unauthenticated) exchanges compared by the Arbitrage tab
+ARB_EXCHANGES = ('binance', 'bybit', 'mexc')
+
+
+@st.cache_resource(show_spinner=False)
+def get_arb_exchanges(exchange_ids: tuple) -> dict:
+    """Public ccxt clients for exchange_ids, created once per process; their loaded markets are reused."""
+    return {ex_id: getattr(ccxt, ex_id)() for ex_id in exchange_ids}
+
+
+@st.cache_resource(show_spinner=False)
+def get_arb_scanner(exchange_ids: tuple, symbol: str, threshold_bps: float = 10.0):
+    """ArbitrageEngine for one symbol over the shared clients of get_arb_exchanges."""
+    return _ArbitrageEngine()(get_arb_exchanges(exchange_ids), [symbol], threshold_bps=threshold_bps)
+
+
+@st.cache_data(ttl=5, max_entries=16, show_spinner=False)
+def scan_arbitrage(exchange_ids: tuple, symbol: str, threshold_bps: float = 10.0) -> list:
+    """
+    One scanner pass (a ticker fetch per exchange), reused for 5s so widget-driven
+    reruns do not fan out to the exchanges again.
+    """
+    return get_arb_scanner(exchange_ids, symbol, threshold_bps).run_once()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _validate_account(_executor: CCXTExecutor, ex_name: str, paper: bool) -> dict:
+    return _executor.validate_account()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _account_info(_executor: CCXTExecutor, ex_name: str, paper: bool) -> dict:
+    return _executor.get_account_info()
+
+
+def validate_account(executor: CCXTExecutor, ex_name: str, paper: bool) -> dict:
+    """Account validation, reused for 60s; failed validations are dropped so a retry hits the exchange."""
+    result = _validate_account(executor, ex_name, paper)
+    if not result.get('valid'):
+        _validate_account.clear()
+    return result
+
+
+def fetch_account_info(executor: CCXTExecutor, ex_name: str, paper: bool, refresh: bool = False) -> dict:
+    """
+    Balance/positions/orders/trades snapshot, reused for 60s across reruns.
+    Pass refresh=True after placing or cancelling orders; error snapshots are never kept.
+    """
+    if refresh:
+        _account_info.clear()
+    info = _account_info(executor, ex_name, paper)
+    if info.get('account_type') == 'error':
+        _account_info.clear()
+    return info
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_symbols(_executor: CCXTExecutor, ex_name: str, paper: bool, quote_currency: str) -> list:
+    """Exchange symbol listing, refreshed at most once per hour."""
+    symbols = _executor.list_symbols(quote_currency)
+    if not symbols:
+        # Raising keeps a transient exchange failure out of the cache
+        raise LookupError(f"No {quote_currency} markets returned by {ex_name}")
+    return symbols
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_timeframes(_executor: CCXTExecutor, ex_name: str, paper: bool) -> list:
+    """Exchange timeframe listing, refreshed at most once per hour."""
+    timeframes = _executor.list_timeframes()
+    if not timeframes:
+        # Raising keeps a transient exchange failure out of the cache
+        raise LookupError(f"No timeframes returned by {ex_name}")
+    return timeframes
+
+
+@st.cache_data(show_spinner=False)
+def order_symbols(symbols_tuple: tuple, popular_tuple: tuple) -> tuple:
+    """
+    Available popular pairs first (in popular order), then every other symbol.
+    Returns (ordered_symbols, symbol_index) where symbol_index maps symbol -> position.
+    """
+    popular_set = frozenset(popular_tuple)
+    symbols_upper = [s.upper() for s in symbols_tuple]
+    available = frozenset(symbols_upper)
+    ordered = [p for p in popular_tuple if p in available]
+    ordered += [s for s, u in zip(symbols_tuple, symbols_upper) if u not in popular_set]
+    ordered = list(dict.fromkeys(ordered))
+    return ordered, {s: i for i, s in enumerate(ordered)}
+
+
+@st.cache_resource(show_spinner=False)
+def get_enhanced_backtester():
+    """Shared EnhancedBacktester (holds only static ticker/timeframe metadata)."""
+    return _EnhancedBacktester()()
+
+
+def trades_fingerprint(trades: list) -> str:
+    """Digest of the trade dicts' contents, used as the cache key for the trade list."""
+    return hashlib.sha1(repr(trades).encode("utf-8")).hexdigest()
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def comprehensive_metrics(equity_curve: np.ndarray, _trades: list, trades_key: str, initial_capital: float):
+    """
+    BacktestMetrics for the equity curve and trades, reused across reruns until the
+    curve, the trades (trades_key, see trades_fingerprint) or the capital change.
+    """
+    return _ComprehensiveMetricsCalculator()().calculate_comprehensive_metrics(
+        equity_curve=pd.Series(equity_curve),
+        trades=_trades,
+        initial_capital=initial_capital,
+        risk_free_rate=0.02
+    )
+
+
+@st.cache_data(show_spinner=False)
+def get_supported_tickers() -> dict:
+    return get_enhanced_backtester().get_supported_tickers()
+
+
+@st.cache_data(show_spinner=False)
+def get_supported_timeframes() -> list:
+    return get_enhanced_backtester().get_supported_timeframes()
+
+
+EXCHANGES = ("binance", "bybit", "mexc", "alpaca", "coinbase", "kraken")
+
+
+@st.cache_resource(show_spinner=False)
+def exchange_credentials() -> dict:
+    """(api_key, api_secret, passphrase) per exchange, read from the environment once per process."""
+    return {
+        ex: (
+            os.getenv(f"{ex.upper()}_API_KEY"),
+            os.getenv(f"{ex.upper()}_API_SECRET"),
+            os.getenv(f"{ex.upper()}_PASSPHRASE"),
+        )
+        for ex in EXCHANGES
+    }
+
+
+# Exchange families that quote in USD instead of USDT
+US_STOCK_EXCHANGES = frozenset({'alpaca'})
+US_CRYPTO_EXCHANGES = frozenset({'coinbase', 'kraken'})
+
+# Popular pairs shown first in the symbol picker, per exchange family
+POPULAR_ALPACA = (
+    "BTCUSD", "ETHUSD", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA",
+    "NVDA", "META", "NFLX", "AMD", "INTC", "CRM", "ADBE", "PYPL"
+)
+POPULAR_USD_CRYPTO = (
+    "BTC-USD", "ETH-USD", "LTC-USD", "BCH-USD", "ETC-USD",
+    "XRP-USD", "ADA-USD", "DOT-USD", "LINK-USD", "UNI-USD"
+)
+POPULAR_USDT = (
+    "BTCUSDT", "ETHUSDT", "BNBUSDT", "ADAUSDT", "SOLUSDT",
+    "XRPUSDT", "DOTUSDT", "DOGEUSDT", "AVAXUSDT", "MATICUSDT",
+    "LINKUSDT", "UNIUSDT", "LTCUSDT", "ATOMUSDT", "FTMUSDT"
+)
+
+TV_SIGNALS_PATH = "logs/tv_signals.jsonl"
+CW_SETTINGS_PATH = "logs/client_weighted_settings.json"
+
+
+# TradingView {{interval}} values -> app timeframe labels; anything else is lower-cased
+TV_TIMEFRAME_MAP = {
+    '1': '1m', '3': '3m', '5': '5m', '10': '10m', '15': '15m', '20': '20m', '30': '30m',
+    '60': '1h', '120': '2h', '180': '3h', '240': '4h', '360': '6h', '480': '8h', '720': '12h',
+    'D': '1d', '2D': '2d', '3D': '3d', '5D': '5d', 'W': '1w', '2W': '2w', '3W': '3w', 'M': '1M',
+}
+
+
+def _categorize_side(df_sig: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize signal columns once at ingest, as categoricals (cheap == compares):
+    'side' lower-cased, and 'timeframe' mapped to app labels in 'tf_norm'.
+    """
+    if 'side' in df_sig.columns:
+        df_sig['side'] = df_sig['side'].astype('string').str.lower().astype('category')
+    if 'timeframe' in df_sig.columns:
+        tf = df_sig['timeframe'].astype('string').str.upper().fillna('')
+        df_sig['tf_norm'] = tf.map(TV_TIMEFRAME_MAP).fillna(tf.str.lower()).astype('category')
+    return df_sig
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def get_recent_signals_http(limit: int = 500) -> pd.DataFrame:
+    """Recent webhook signals from the realtime server, shared across reruns for a few seconds."""
+    return _categorize_side(fetch_recent_signals_http(limit=limit))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_signals_file(store_path: str, mtime: float) -> pd.DataFrame:
+    return _categorize_side(load_tradingview_signals(store_path))
+
+
+def get_stored_signals(store_path: str = TV_SIGNALS_PATH) -> pd.DataFrame:
+    """Signals from the webhook store, re-parsed only when the file changes."""
+    try:
+        mtime = os.path.getmtime(store_path)
+    except OSError:
+        return pd.DataFrame()
+    return _load_signals_file(store_path, mtime)
+
+
+def get_tv_signals() -> pd.DataFrame:
+    """Realtime server first, then fall back to the file store."""
+    df_sig = get_recent_signals_http(limit=500)
+    if df_sig.empty:
+        df_sig = get_stored_signals()
+    return df_sig
+
+
+OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def fetch_ohlcv(_executor: CCXTExecutor, ex_name: str, paper: bool, symbol: str, timeframe: str,
+                limit: int, refresh_slot: int) -> pd.DataFrame:
+    """
+    OHLCV bars shared by every rerun inside one refresh interval.
+    refresh_slot is `time.time() // refresh_secs`, so widget interactions reuse the last
+    download and the next auto-refresh tick fetches fresh bars.
+    """
+    df = _executor.fetch_ohlcv_df(symbol, timeframe=timeframe, limit=limit)
+    if df.empty:
+        # Raising keeps a failed download out of the cache
+        raise ValueError("No data returned from exchange")
+    # Keep only the bar columns (the Bybit fetcher returns extras such as turnover),
+    # so the cached payload and every downstream copy stay narrow
+    return df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def fetch_ticker(_executor: CCXTExecutor, ex_name: str, paper: bool, symbol: str, refresh_slot: int) -> dict:
+    """Market-tab ticker, refreshed on the same refresh_slot schedule as fetch_ohlcv."""
+    tk = _executor.fetch_ticker(symbol)
+    if not tk:
+        # Raising keeps a failed request out of the cache
+        raise LookupError(f"No ticker returned for {symbol}")
+    return tk
+
+
+# yfinance (period, interval) per chart timeframe; anything else falls back to daily bars
+YF_FALLBACK_PARAMS = {
+    '1m': ("1d", "1m"),
+    '5m': ("7d", "5m"),
+    '15m': ("30d", "15m"),
+    '1h': ("60d", "60m"),
+    '4h': ("730d", "240m"),
+}
+
+
+@st.cache_data(ttl=60, max_entries=16, show_spinner=False)
+def fetch_yf_ohlc(ex_name: str, symbol: str, timeframe: str) -> pd.DataFrame:
+    """Display-only OHLC from yfinance, reused across reruns for a minute."""
+    period, interval = YF_FALLBACK_PARAMS.get(str(timeframe).lower(), ("1y", "1d"))
+    tmp = _yf().download(to_yfinance_symbol(ex_name, symbol), period=period, interval=interval, progress=False)
+    if tmp.empty:
+        # Raising keeps an empty download out of the cache
+        raise ValueError(f"No yfinance data for {symbol}")
+    return tmp.reset_index().rename(columns={'Date': 'timestamp', 'Datetime': 'timestamp', 'Open': 'open',
+                                             'High': 'high', 'Low': 'low', 'Close': 'close'})
+
+
+def utc_ns_key(ts: pd.Series) -> pd.Series:
+    """
+    Non-null timestamps as int64 UTC epoch nanoseconds (as-of join key). Naive values
+    are taken as UTC, which is what the exchanges return, so naive bars and tz-aware
+    webhook times line up.
+    """
+    return pd.to_datetime(ts, utc=True).dt.as_unit('ns').astype('int64')
+
+
+# Columns copied from TradingTriggerEngine.generate_combined_signals onto df
+TRIGGER_SIGNAL_COLUMNS = (
+    'final_buy', 'final_sell', 'wt_buy', 'wt_sell',
+    'momentum_buy', 'momentum_sell', 'rsi_buy', 'rsi_sell',
+)
+
+# Signal badge per trigger, highest priority first: (column, badge, description, color)
+BUY_TRIGGER_BADGES = (
+    ('wt_buy', "WT Green Dot", "Highest Priority", "#00ff88"),
+    ('momentum_buy', "Momentum BUY", "Medium Priority", "#22cc88"),
+    ('rsi_buy', "RSI BUY", "Low Priority", "#88cc22"),
+)
+SELL_TRIGGER_BADGES = (
+    ('wt_sell', "WT Red Dot", "Highest Priority", "#ff4444"),
+    ('momentum_sell', "Momentum SELL", "Medium Priority", "#cc2222"),
+    ('rsi_sell', "RSI SELL", "Low Priority", "#cc8822"),
+)
+
+
+# trigger_name value -> (badge, description, color); 'BUY'/'SELL' name a final signal
+# that no individual trigger column explains
+TRIGGER_BADGES = {
+    **{badge: (badge, description, color)
+       for _, badge, description, color in BUY_TRIGGER_BADGES + SELL_TRIGGER_BADGES},
+    "BUY": ("BUY Signal", "", "#22cc88"),
+    "SELL": ("SELL Signal", "", "#cc2222"),
+}
+# Signals-tab badge for a bar without a signal
+NO_SIGNAL_BADGE = ("No Signal", "", "#a0aec0")
+
+
+def trigger_names(signals: dict) -> pd.Categorical:
+    """
+    Per-bar name of the highest-priority trigger behind final_buy/final_sell (BUY
+    first), as a categorical over TRIGGER_BADGES; NaN on bars without a signal.
+    """
+    conditions, names = [], []
+    for final, badges in (('final_buy', BUY_TRIGGER_BADGES), ('final_sell', SELL_TRIGGER_BADGES)):
+        fired = np.asarray(signals[final], dtype=bool)
+        for col, badge, _, _ in badges:
+            if col in signals:
+                conditions.append(fired & np.asarray(signals[col], dtype=bool))
+                names.append(badge)
+        conditions.append(fired)
+        names.append("BUY" if final == 'final_buy' else "SELL")
+    return pd.Categorical(np.select(conditions, names, default=""), categories=list(TRIGGER_BADGES))
+
+
+# The lightweight-charts panel fails inside Streamlit's sandboxed iframe, so the
+# Plotly chart is shown instead and the LWC payload is not built
+LWC_ENABLED = False
+
+# Bump when the indicator maths changes so on-disk frames from older code are ignored
+INDICATORS_CACHE_VERSION = 1
+
+# Storage dtypes for compute_indicators output. The kernels always run in float64;
+# display-only and threshold-compared columns are then stored as float32. OHLC and
+# WaveTrend (whose two lines are crossed against each other) stay float64.
+INDICATOR_DTYPES = {
+    'rsi': np.float32, 'stoch': np.float32,
+    'ema20': np.float32, 'ema50': np.float32, 'ema200': np.float32,
+    'ema_fast': np.float32, 'ema_slow': np.float32,
+    'sar': np.float32, 'hlc3': np.float32,
+}
+
+
+def _ohlc_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Cheap cache identity for an OHLC frame: its columns, the bar window and the
+    still-forming last bar.
+    """
+    if df.empty:
+        return (tuple(df.columns),)
+    last = df.iloc[-1]
+    return (
+        tuple(df.columns), len(df), str(df['timestamp'].iat[0]), str(last['timestamp']),
+        float(last['open']), float(last['high']), float(last['low']), float(last['close']),
+    )
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False, hash_funcs={pd.DataFrame: _ohlc_fingerprint})
+def compute_indicators(df: pd.DataFrame, rsi_length: int, wt_channel: int, wt_avg: int) -> pd.DataFrame:
+    """
+    Return df with RSI, EMAs, Stochastic, Parabolic SAR, hlc3 and WaveTrend columns added.
+    The frame is hashed by _ohlc_fingerprint instead of its contents, so reruns on
+    unchanged bars (any widget interaction) are a cache lookup. Results are also kept
+    in the on-disk cache, so a restarted app reuses frames it already computed.
+    """
+    # The disk key also digests the close column: it outlives the process, so it
+    # should not rely on the fingerprint alone
+    disk_key = disk_cache.cache_key(
+        INDICATORS_CACHE_VERSION, _ohlc_fingerprint(df), rsi_length, wt_channel, wt_avg,
+        hashlib.sha1(df['close'].to_numpy().tobytes()).hexdigest(), INDICATOR_DTYPES,
+    )
+    cached = disk_cache.load_frame('indicators', disk_key)
+    if cached is not None:
+        return cached
+    
+    # Convert to float64 arrays once; the indicators run on raw ndarrays
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    # hlc3 built in one buffer rather than three temporaries
+    hlc3 = np.add(high, low)
+    hlc3 += close
+    hlc3 /= 3.0
+    
+    # RSI and the 20/50/200 EMAs share one pass over close
+    rsi_values, emas = rsi_ema_multi(close, length=rsi_length, ema_lengths=(20, 50, 200))
+    ema20, ema50, ema200 = emas.T
+    wt1, wt2 = wavetrend(hlc3, channel_length=wt_channel, average_length=wt_avg)
+    indicators = pd.DataFrame({
+        'rsi': rsi_values,
+        # EMA indicators for image-style chart
+        'ema20': ema20,
+        'ema50': ema50,
+        'ema200': ema200,
+        # For Pine script compatibility
+        'ema_fast': ema50,
+        'ema_slow': ema200,
+        'stoch': stochastic(high, low, close, length=14),
+        'sar': parabolic_sar(high, low, close, af_start=0.02, af_increment=0.02, af_max=0.2),
+        'hlc3': hlc3,
+        'wt1': wt1,
+        'wt2': wt2,
+    }, index=df.index).astype(INDICATOR_DTYPES)
+    result = pd.concat([df, indicators], axis=1)
+    disk_cache.store_frame('indicators', disk_key, result)
+    return result
+
+
+# st.fragment is stable from Streamlit 1.37; 1.33-1.36 ship it as experimental_fragment
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+
+@fragment
+def render_risk_settings() -> dict:
+    """
+    Stop-loss / take-profit / breaker widgets. Runs as a fragment, so adjusting them
+    reruns only this panel; the trading loop picks the values up on the next full run.
+    """
+    with st.expander("🔧 Configurable Stop-Loss Settings", expanded=False):
+        stop_loss_type = st.selectbox(
+            "Stop Loss Type",
+            ["percentage", "atr", "support_resistance", "volatility"],
+            index=0,
+            help="Choose stop loss calculation method"
+        )
+        
+        if stop_loss_type == "percentage":
+            stop_loss_value = st.slider(
+                "Stop Loss Percentage",
+                min_value=0.5,
+                max_value=10.0,
+                value=2.0,
+                step=0.1,
+                format="%.1f%%",
+                help="Stop loss as percentage of entry price"
+            ) / 100
+        elif stop_loss_type == "atr":
+            stop_loss_value = st.slider(
+                "ATR Multiplier",
+                min_value=0.5,
+                max_value=5.0,
+                value=2.0,
+                step=0.1,
+                help="ATR multiplier for stop loss distance"
+            )
+        elif stop_loss_type == "support_resistance":
+            stop_loss_value = st.slider(
+                "Support/Resistance Distance",
+                min_value=1.0,
+                max_value=5.0,
+                value=2.0,
+                step=0.1,
+                format="%.1f%%",
+                help="Distance from support/resistance levels"
+            ) / 100
+        else:  # volatility
+            stop_loss_value = st.slider(
+                "Volatility Multiplier",
+                min_value=1.0,
+                max_value=3.0,
+                value=2.0,
+                step=0.1,
+                help="Volatility multiplier for stop loss"
+            )
+        
+        # TP1/TP2/Runner Configuration
+        st.markdown("**Take Profit Configuration**")
+        tp1_multiplier = st.slider(
+            "TP1 Multiplier",
+            min_value=1.0,
+            max_value=3.0,
+            value=1.5,
+            step=0.1,
+            help="TP1 as multiple of risk"
+        )
+        
+        tp2_multiplier = st.slider(
+            "TP2 Multiplier", 
+            min_value=2.0,
+            max_value=5.0,
+            value=2.0,
+            step=0.1,
+            help="TP2 as multiple of risk"
+        )
+        
+        runner_multiplier = st.slider(
+            "Runner Multiplier",
+            min_value=3.0,
+            max_value=10.0,
+            value=3.0,
+            step=0.1,
+            help="Runner activation as multiple of risk"
+        )
+        
+        # Daily Breaker
+        daily_breaker_active = st.checkbox(
+            "Enable Daily Breaker",
+            value=False,
+            help="Stop trading after daily loss limit"
+        )
+        
+        if daily_breaker_active:
+            daily_loss_limit = st.slider(
+                "Daily Loss Limit",
+                min_value=1.0,
+                max_value=10.0,
+                value=5.0,
+                step=0.5,
+                format="%.1f%%",
+                help="Maximum daily loss as percentage of capital"
+            ) / 100
+        else:
+            daily_loss_limit = 0.05
+        
+        # Additional Risk Parameters
+        st.markdown("**Additional Risk Parameters**")
+        max_bars_in_trade = st.number_input(
+            "Max Bars in Trade", 
+            min_value=1, 
+            max_value=10000, 
+            value=100,
+            help="Maximum number of bars to hold a position"
+        )
+    
+    return {
+        'stop_loss_type': stop_loss_type,
+        'stop_loss_value': stop_loss_value,
+        'tp1_multiplier': tp1_multiplier,
+        'tp2_multiplier': tp2_multiplier,
+        'runner_multiplier': runner_multiplier,
+        'daily_breaker_active': daily_breaker_active,
+        'daily_loss_limit': daily_loss_limit,
+        'max_bars_in_trade': max_bars_in_trade,
+    }
+
+
+# Per-session trading state; callables are factories so each session gets fresh objects.
+SESSION_DEFAULTS = {
+    'account': None,  # built from the initial capital in init_session_state
+    'position': None,
+    'trades': list,
+    'arb_running': False,
+    'real_account_data': None,
+    'account_validation': None,
+}
+
+
+def init_session_state(initial_cap: float):
+    """Seed SESSION_DEFAULTS into st.session_state once per session."""
+    if st.session_state.get('_session_initialized'):
+        return
+    for key, default in SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, default() if callable(default) else default)
+    if st.session_state['account'] is None:
+        st.session_state['account'] = {'cash': float(initial_cap), 'equity': [float(initial_cap)]}
+    st.session_state['_session_initialized'] = True
+
+
+# Live equity ticks are kept in a preallocated float64 ring of this many samples
+EQUITY_HISTORY_CAP = 65536
+
+
+def _is_equity_ring(account: dict) -> bool:
+    return isinstance(account.get('equity'), np.ndarray) and 'equity_len' in account
+
+
+def set_equity_history(account: dict, values) -> None:
+    """Replace the equity history with a plain curve (e.g. a backtest result)."""
+    account['equity'] = np.asarray(values, dtype=np.float64)
+    account.pop('equity_len', None)
+
+
+def record_equity(account: dict, value: float) -> None:
+    """
+    Append an equity sample to account['equity']. A plain history (initial seed list
+    or a backtest curve) is moved into a ring buffer on first use; account['equity_len']
+    counts every sample written, so the ring keeps the latest EQUITY_HISTORY_CAP.
+    """
+    buf = account.get('equity')
+    if not _is_equity_ring(account):
+        seed = np.asarray(buf if buf is not None else [], dtype=np.float64)[-EQUITY_HISTORY_CAP:]
+        buf = np.empty(EQUITY_HISTORY_CAP, dtype=np.float64)
+        buf[:len(seed)] = seed
+        account['equity'], account['equity_len'] = buf, len(seed)
+    n = account['equity_len']
+    buf[n % EQUITY_HISTORY_CAP] = value
+    account['equity_len'] = n + 1
+
+
+def equity_history(account: dict) -> np.ndarray:
+    """Equity samples oldest first (a view of the ring until it wraps)."""
+    buf = account.get('equity')
+    if not _is_equity_ring(account):
+        return np.asarray(buf if buf is not None else [], dtype=np.float64)
+    n = account['equity_len']
+    if n <= len(buf):
+        return buf[:n]
+    head = n % len(buf)
+    return np.concatenate((buf[head:], buf[:head]))
+
+
+def open_position(executor: CCXTExecutor, symbol: str, side: str, price: float, entry_idx: int,
+                  risk_per_trade: float, levels: dict, strategy: str, ts: int,
+                  signal_entry: dict = None) -> None:
+    """
+    Size an entry from the account cash, place the market order and record it as the
+    open position, in the trade list and in logs/trades.csv (ts, epoch ms). side is 'buy'
+    (long) or 'sell' (short, stored with a negative qty); signal_entry carries signal_type
+    and the entry RSI/WaveTrend values when the entry came from a trigger.
+    """
+    qty = position_size_from_risk(st.session_state['account']['cash'], float(risk_per_trade), price)
+    if qty <= 0:
+        return
+    executor.place_market_order(symbol, side, qty)
+    signed_qty = qty if side == 'buy' else -qty
+    position = {'entry_price': price, 'qty': signed_qty, 'entry_idx': entry_idx, 'strategy': strategy}
+    trade = {'entry_idx': entry_idx, 'entry_price': price, 'qty': signed_qty, 'strategy': strategy}
+    record = {'symbol': symbol, 'side': side, 'qty': qty, 'price': price, 'strategy': strategy}
+    if signal_entry is not None:
+        position.update(signal_entry)
+        trade.update(signal_type=signal_entry['signal_type'], entry_rsi=signal_entry['entry_rsi'])
+        record.update(signal_type=signal_entry['signal_type'], rsi=signal_entry['entry_rsi'])
+    st.session_state['position'] = {**position, **levels}
+    st.session_state['trades'].append(trade)
+    log_trade('logs/trades.csv', {**record, 'ts': ts})
+
+
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "app.css")
+
+_STATUS_INDICATOR = string.Template("""
+<div class="status-indicator $status_class">
+    <div class="status-dot"></div>
+    $status_text
+</div>
+""")
+
+_SECTION_HEADER = string.Template('<div class="section-header">$title</div>')
+
+_SUGGESTIONS_HEADER = "**💡 Suggestions:**"
+
+_REAL_LIST_HEADER = string.Template("""<div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; border: 1px solid var(--border-color); margin: 1rem 0;">
+    <h4 style="margin: 0 0 1rem 0; color: var(--text-primary);">$title</h4>
+</div>""")
+
+_REAL_POSITION_CARD = string.Template("""<div style="background: var(--secondary-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0; border-left: 4px solid $pnl_color;">
+    <div style="display: flex; justify-content: space-between; align-items: center;">
+        <span style="color: var(--text-primary); font-weight: 600;">$symbol</span>
+        <span style="color: $pnl_color; font-weight: 600;">$$$pnl</span>
+    </div>
+    <div style="color: var(--text-secondary); font-size: 0.9rem;">
+        $side • Size: $size
+    </div>
+</div>""")
+
+_REAL_ORDER_CARD = string.Template("""<div style="background: var(--secondary-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0;">
+    <div style="display: flex; justify-content: space-between; align-items: center;">
+        <span style="color: var(--text-primary); font-weight: 600;">$symbol</span>
+        <span style="color: var(--text-secondary); font-size: 0.9rem;">$status</span>
+    </div>
+    <div style="color: var(--text-secondary); font-size: 0.9rem;">
+        $side • Qty: $qty • ID: $order_id...
+    </div>
+</div>""")
+_ORDER_MANAGE_CARD = string.Template("""<div style="background: var(--card-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0;">
+    <div style="color: var(--text-primary); font-weight: 600;">$symbol • $side</div>
+    <div style="color: var(--text-secondary); font-size: 0.9rem;">
+        Qty: $qty • Price: $$$price • Status: $status
+    </div>
+    <div style="color: var(--text-secondary); font-size: 0.8rem;">
+        ID: $order_id
+    </div>
+</div>""")
+_REAL_EMPTY_CARD = string.Template("""<div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; border: 1px solid var(--border-color); margin: 1rem 0; text-align: center;">
+    <h4 style="margin: 0 0 0.5rem 0; color: var(--text-primary);">$title</h4>
+    <p style="color: var(--text-secondary); margin: 0;">$message</p>
+</div>""")
+
+_REAL_TRADE_CARD = string.Template("""
+                <div style="background: var(--card-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0; border-left: 4px solid var(--accent-blue);">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <span style="color: var(--text-primary); font-weight: 600;">$symbol</span>
+                        <span style="color: var(--text-secondary); font-size: 0.9rem;">$trade_time</span>
+                    </div>
+                    <div style="color: var(--text-secondary); font-size: 0.9rem;">
+                        $side • Qty: $qty • Price: $$$price
+                    </div>
+                </div>
+""")
+
+# Signals tab (the grid is also used by the Market tab): one grid per row of cards,
+# emitted with a single st.markdown. Cells carry no leading/trailing newlines: a
+# blank line inside the HTML block would end it and markdown would render the
+# indented remainder as a code block.
+_SIGNAL_TAB_GRID = string.Template("""
+<div style='margin-bottom: 1rem;'>$title
+    <div style='display: grid; grid-template-columns: repeat($columns, 1fr); gap: 1rem;'>$cells</div>
+</div>
+""")
+
+_SIGNAL_TAB_STATUS_CELL = string.Template("""<div>
+            <p style='margin: 0 0 0.5rem 0; font-weight: 700;'>$title</p>
+            <div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; border-left: 4px solid $border_color;'>
+                <h3 style='color: $color; margin: 0;'>$headline</h3>$caption
+            </div>
+        </div>""")
+
+_SIGNAL_TAB_CAPTION = string.Template("<p style='color: #888; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>$text</p>")
+
+_SIGNAL_TAB_INDICATOR_CELL = string.Template("""<div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; text-align: center;'>
+            <p style='color: #888; margin: 0; font-size: 0.8rem;'>$label</p>
+            <h2 style='color: $color; margin: 0;'>$value</h2>
+        </div>""")
+
+# Strategy tab: display name and entry-condition list items per strategy;
+# {rsi_threshold} is filled in at render time
+STRATEGY_LABELS = {
+    'auto': 'TradingView Webhook + RSI + WaveTrend (Auto)',
+    'ema_crossover': 'EMA Crossover',
+    'rsi_bbands': 'RSI + Bollinger Bands',
+    'grid': 'Grid Trading',
+}
+
+_ENTRY_CONDITIONS_HTML = {
+    'auto': (
+        '<li>Priority 1: WaveTrend cross up (WT1 > WT2)</li>'
+        '<li>Priority 2: TradingView Webhook buy signal</li>'
+        '<li>Priority 3: RSI > 53 (Buy) or RSI < 47 (Sell)</li>'
+    ),
+    'rsi_bbands': (
+        '<li>RSI below oversold threshold ({rsi_threshold})</li>'
+        '<li>Price below Bollinger Lower Band</li>'
+    ),
+    'ema_crossover': '<li>EMA Fast crosses above EMA Slow</li>',
+    'grid': '<li>Price crosses below grid level</li>',
+}
+
+# Market tab: one read-only stat per cell of a two-column grid; $delta is an
+# optional coloured line under the value
+_MARKET_STAT_CELL = string.Template("""<div style='padding: 0.75rem 1rem; background: var(--card-bg); border-radius: 8px;'>
+            <p style='color: var(--text-secondary); margin: 0; font-size: 0.85rem;'>$label</p>
+            <p style='color: var(--text-primary); margin: 0; font-size: 1.6rem; font-weight: 600;'>$value</p>$delta
+        </div>""")
+
+_MARKET_STAT_DELTA = string.Template("<p style='color: $color; margin: 0; font-size: 0.85rem;'>$arrow $text</p>")
+
+_KPI_CARD = string.Template("""
+    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
+                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
+                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
+        <div style="font-size: $value_size; font-weight: 700; color: $color; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
+            $value
+        </div>
+        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">$label</div>
+        <div style="$caption_style">$caption</div>
+    </div>
+""")
+
+# Caption styles for _KPI_CARD: status captions take the value colour, info captions are muted.
+_KPI_STATUS_CAPTION = string.Template(
+    "color: $color; font-size: 0.9rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;"
+)
+_KPI_INFO_CAPTION = "color: #a0aec0; font-size: 0.9rem; font-weight: 500;"
+
+_SIDEBAR_POSITION_CARD = string.Template("""
+        <div style="background: var(--secondary-bg); padding: 1rem; border-radius: 8px; 
+                    border: 1px solid var(--border-color); margin: 1rem 0; text-align: center;">
+            <div style="font-size: 0.9rem; color: var(--text-secondary); margin-bottom: 0.5rem;">Active Position</div>
+            <div style="font-size: 1.5rem; font-weight: 700; color: $pnl_color;">$$$pnl</div>
+            <div style="font-size: 0.8rem; color: var(--text-secondary);">Unrealized P&L</div>
+        </div>
+""")
+
+_OPEN_POSITION_ROW = string.Template("""
+                <div style="display: flex; justify-content: space-between;">
+                    <span style="color: var(--text-secondary);">$label</span>
+                    <span style="color: $color; font-weight: $weight;">$value</span>
+                </div>""")
+
+_OPEN_POSITION_CARD = string.Template("""
+        <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
+                    border: 1px solid var(--border-color);">
+            <h4 style="margin: 0 0 1rem 0; color: var(--text-primary); display: flex; align-items: center; gap: 0.5rem;">
+                📈 Open Position
+            </h4>
+            <div style="display: grid; gap: 0.75rem;">$rows
+                <hr style="border-color: var(--border-color); margin: 0.5rem 0;">$levels
+            </div>
+        </div>
+""")
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def kpi_card_html(value: str, label: str, color: str, caption: str, status: bool = True,
+                  value_size: str = "2.5rem") -> str:
+    """
+    One dashboard KPI tile; status captions are tinted with the value colour.
+    Cached across reruns on the already-formatted arguments, so reruns where the
+    displayed numbers have not changed reuse the tile's HTML.
+    """
+    caption_style = _KPI_STATUS_CAPTION.substitute(color=color) if status else _KPI_INFO_CAPTION
+    return _KPI_CARD.substitute(value=value, label=label, color=color, caption=caption,
+                                caption_style=caption_style, value_size=value_size)
+
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def strategy_tab_html(strategy: str, sl_display: str, tp_display: str, max_bars: int, rsi_threshold: float,
+                      is_trading: bool, last_signal: str, refresh_secs: int) -> str:
+    """
+    Strategy tab body: active strategy card, entry/exit condition lists and status box.
+    Cached across reruns on the displayed settings, so reruns that change none of them
+    reuse the string; lines carry no indentation and no blank lines so markdown keeps it as HTML.
+    """
+    strategy_name = STRATEGY_LABELS.get(strategy, STRATEGY_LABELS['auto'])
+    entry_conditions = _ENTRY_CONDITIONS_HTML.get(strategy, '').format(rsi_threshold=rsi_threshold)
+    exit_conditions = [f'Stop Loss: {sl_display}', f'Take Profit: {tp_display}']
+    if strategy == 'auto':
+        exit_conditions.append('WaveTrend cross down')
+    exit_conditions.append(f'Max bars in trade: {max_bars}')
+    status_color = "var(--accent-green)" if is_trading else "var(--accent-red)"
+    status_emoji = "🟢 LIVE TRADING" if is_trading else "🔴 STOPPED"
+    return "\n".join([
+        '<div class="strategy-card">',
+        f'<div class="strategy-header">🎯 Active Strategy: {strategy_name}</div>',
+        '</div>',
+        f'<div class="conditions-list"><h4>Entry Conditions</h4><ul>{entry_conditions}</ul></div>',
+        '<div class="conditions-list"><h4>Exit Conditions</h4><ul>'
+        + "".join(f'<li>{item}</li>' for item in exit_conditions) + '</ul></div>',
+        '<div class="status-box">',
+        f'<div class="status-text" style="color: {status_color};">{status_emoji}</div>',
+        f'<div class="status-details">Last signal: {last_signal} • Next refresh: {refresh_secs}s</div>',
+        '</div>',
+    ])
+
+def open_position_html(entry_price: float, qty: float, pnl: float, pnl_color: str, bars_in_trade: int,
+                       stop_loss: float, take_profit: float) -> str:
+    primary = "var(--text-primary)"
+    rows = "".join([
+        _OPEN_POSITION_ROW.substitute(label="Entry Price:", color=primary, weight=600, value=f"${entry_price:.6f}"),
+        _OPEN_POSITION_ROW.substitute(label="Quantity:", color=primary, weight=600, value=f"{qty:.6f}"),
+        _OPEN_POSITION_ROW.substitute(label="Unrealized P&L:", color=pnl_color, weight=700, value=f"${pnl:,.2f}"),
+        _OPEN_POSITION_ROW.substitute(label="Bars in Trade:", color=primary, weight=600, value=bars_in_trade),
+    ])
+    levels = "".join([
+        _OPEN_POSITION_ROW.substitute(label="Stop Loss:", color="var(--accent-red)", weight=600,
+                                      value=f"${stop_loss:.6f}"),
+        _OPEN_POSITION_ROW.substitute(label="Take Profit:", color="var(--accent-green)", weight=600,
+                                      value=f"${take_profit:.6f}"),
+    ])
+    return _OPEN_POSITION_CARD.substitute(rows=rows, levels=levels)
+
+
+def render_real_account(real_data):
+    """Sidebar positions/orders lists (first five of each); nothing to do without a real-account snapshot."""
+    if not real_data:
+        return
+    
+    positions = real_data.get('positions') or []
+    if positions:
+        # Header and the first 5 position cards in one markdown block
+        parts = [_REAL_LIST_HEADER.substitute(title=f"📈 Real Positions ({len(positions)})")]
+        for pos in positions[:5]:
+            unrealized_pnl = float(pos.get('unrealizedPnl', 0))
+            parts.append(_REAL_POSITION_CARD.substitute(
+                symbol=pos.get('symbol', 'Unknown'),
+                side=pos.get('side', 'Unknown'),
+                size=pos.get('size', 0),
+                pnl=f"{unrealized_pnl:,.2f}",
+                pnl_color="var(--accent-green)" if unrealized_pnl >= 0 else "var(--accent-red)",
+            ))
+        st.markdown("\n".join(parts), unsafe_allow_html=True)
+    else:
+        st.markdown(_REAL_EMPTY_CARD.substitute(title="📈 Real Positions", message="No open positions"),
+                    unsafe_allow_html=True)
+    
+    orders = real_data.get('orders') or []
+    if orders:
+        # Header and the first 5 order cards in one markdown block
+        parts = [_REAL_LIST_HEADER.substitute(title=f"📋 Real Orders ({len(orders)})")]
+        for order in orders[:5]:
+            parts.append(_REAL_ORDER_CARD.substitute(
+                symbol=order.get('symbol', 'Unknown'),
+                side=order.get('side', 'Unknown'),
+                qty=order.get('qty', 0),
+                status=order.get('orderStatus', 'Unknown'),
+                order_id=order.get('orderId', 'Unknown')[:8],
+            ))
+        st.markdown("\n".join(parts), unsafe_allow_html=True)
+    else:
+        st.markdown(_REAL_EMPTY_CARD.substitute(title="📋 Real Orders", message="No open orders"),
+                    unsafe_allow_html=True)
+
+
+def section_header_html(title: str) -> str:
+    return _SECTION_HEADER.substitute(title=title)
+
+
+def section_header(title: str):
+    """Emit a sidebar/page section header."""
+    st.markdown(section_header_html(title), unsafe_allow_html=True)
+
+
+def show_suggestions(suggestions: list):
+    """Render error-handler suggestions as one markdown block."""
+    if suggestions:
+        st.markdown("\n\n".join([_SUGGESTIONS_HEADER] + [f"• {suggestion}" for suggestion in suggestions]))
+
+
+SIDEBAR_HEADER_HTML = """
+<div class="sidebar-header">
+    <h1>🚀 Trading Platform</h1>
+    <div class="subtitle">Multi-Exchange Trading Dashboard</div>
+</div>
+"""
+
+
+@st.cache_data(show_spinner=False)
+def load_css(path: str = CSS_PATH) -> str:
+    """Read the app stylesheet from disk once per process."""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _frame_digest(df: pd.DataFrame) -> tuple:
+    """Content hash for small display frames (cell values, index and column names)."""
+    try:
+        values = pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()
+    except TypeError:
+        # Unhashable cells (dicts/lists from exchange payloads)
+        values = repr(df.to_dict('split'))
+    return (tuple(df.columns), values)
+
+
+@st.cache_data(max_entries=32, show_spinner=False, hash_funcs={pd.DataFrame: _frame_digest})
+def frame_to_html(df: pd.DataFrame, time_format: str = None, decimals: int = None) -> str:
+    """
+    HTML table for st.markdown, memoized on the frame's content so unchanged tables
+    skip the formatting on reruns. Optionally formats 'timestamp' and rounds first.
+    """
+    if time_format is not None:
+        df = df.assign(timestamp=df['timestamp'].dt.strftime(time_format))
+    if decimals is not None:
+        df = df.round(decimals)
+    return df.to_html(escape=False, index=False)
+
+
+SPARKLINE_CONFIG = {'displaylogo': False, 'modeBarButtonsToRemove': ['select2d', 'lasso2d']}
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def sparkline_figure(x: np.ndarray, y: np.ndarray, name: str, color: str, dark: bool, y_range: tuple = None) -> go.Figure:
+    """
+    Small indicator trend line for the sparkline row. Memoized on the (short) tail
+    arrays, so reruns with unchanged bars reuse the built figure.
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', line=dict(color=color, width=2), name=name))
+    fig.update_layout(
+        height=150,
+        margin=dict(l=10, r=10, t=20, b=10),
+        xaxis_visible=False,
+        yaxis_title=name,
+        template='plotly_dark' if dark else 'plotly_white',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=False
+    )
+    if y_range is not None:
+        fig.update_yaxes(range=list(y_range))
+    return fig
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = False) -> go.Figure:
+    """
+    create_premium_chart memoized on the frame's content, so reruns triggered by
+    unrelated widgets reuse the figure instead of rebuilding every subplot.
+    """
+    return create_premium_chart(df, symbol, show_volume=show_volume)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def signal_history_html(recent: pd.DataFrame) -> str:
+    """
+    Cards for the last 10 bars of recent that carry a trigger_name ("" if none).
+    Memoized on the slice's content, so reruns without a new or changed bar skip
+    the card rendering.
+    """
+    # trigger_name is set exactly on bars with a final BUY/SELL, so one mask
+    # selects them instead of walking the rows
+    history = recent.loc[recent['trigger_name'].notna().to_numpy()].tail(10)
+    cards = []
+    for sig in history.itertuples(index=False):
+        time_str = sig.timestamp.strftime('%Y-%m-%d %H:%M:%S') if hasattr(sig.timestamp, 'strftime') else str(sig.timestamp)
+        _, description, color = TRIGGER_BADGES[sig.trigger_name]
+        cards.append(signal_card_html(
+            sig.trigger_name, description, color, time_str,
+            float(sig.close), float(sig.rsi), float(sig.wt1), float(sig.wt2),
+        ))
+    return "".join(cards)
 
-# Ensure yfinance uses standard requests (avoid curl_cffi impersonate)
-os.environ.setdefault("YFINANCE_DISABLE_CURL_CFFI", "1")
-try:
-    import requests as _pyrequests
-    _shim = types.ModuleType('curl_cffi')
-    _shim.requests = _pyrequests
-    sys.modules['curl_cffi'] = _shim
-except Exception:
-    pass
-import yfinance as yf
-from streamlit.components.v1 import html
 
 st.set_page_config(
     page_title="Multi-Exchange Trading Platform", 
@@ -151,253 +1189,11 @@ st.set_page_config(
     page_icon="📈"
 )
 
-# Enhanced CSS styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Root Variables */
-    :root {
-        --primary-bg: #0a0e1a;
-        --secondary-bg: #1a1f2e;
-        --card-bg: #252b3d;
-        --border-color: #2d3748;
-        --text-primary: #ffffff;
-        --text-secondary: #a0aec0;
-        --accent-green: #48bb78;
-        --accent-red: #f56565;
-        --accent-blue: #4299e1;
-        --accent-purple: #9f7aea;
-        --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        --border-radius: 12px;
-        --font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-    
-    /* Global Styles */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-        max-width: 1400px;
-    }
-    
-    /* Sidebar Styling */
-    .css-1d391kg {
-        background-color: var(--primary-bg);
-        border-right: 1px solid var(--border-color);
-    }
-    
-    /* Custom Sidebar Header */
-    .sidebar-header {
-        background: linear-gradient(135deg, var(--accent-blue), var(--accent-purple));
-        padding: 1.5rem;
-        margin: -1rem -1rem 2rem -1rem;
-        border-radius: 0 0 var(--border-radius) var(--border-radius);
-        text-align: center;
-    }
-    
-    .sidebar-header h1 {
-        color: white;
-        font-size: 1.5rem;
-        font-weight: 700;
-        margin: 0;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    .sidebar-header .subtitle {
-        color: rgba(255,255,255,0.8);
-        font-size: 0.875rem;
-        margin-top: 0.25rem;
-    }
-    
-    /* Section Headers */
-    .section-header {
-        background: var(--card-bg);
-        padding: 0.75rem 1rem;
-        margin: 1rem -1rem 1rem -1rem;
-        border-left: 4px solid var(--accent-blue);
-        border-radius: 0 var(--border-radius) var(--border-radius) 0;
-        font-weight: 600;
-        color: var(--text-primary);
-        font-size: 0.95rem;
-    }
-    
-    /* Control Groups */
-    .control-group {
-        background: var(--secondary-bg);
-        padding: 1rem;
-        border-radius: var(--border-radius);
-        margin-bottom: 1rem;
-        border: 1px solid var(--border-color);
-    }
-    
-    /* Status Indicators */
-    .status-indicator {
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        font-size: 0.875rem;
-        font-weight: 500;
-    }
-    
-    .status-trading {
-        background: rgba(72, 187, 120, 0.1);
-        color: var(--accent-green);
-        border: 1px solid var(--accent-green);
-    }
-    
-    .status-stopped {
-        background: rgba(245, 101, 101, 0.1);
-        color: var(--accent-red);
-        border: 1px solid var(--accent-red);
-    }
-    
-    .status-dot {
-        width: 8px;
-        height: 8px;
-        border-radius: 50%;
-        background: currentColor;
-    }
-    
-    /* Action Buttons */
-    .action-button {
-        width: 100%;
-        padding: 0.75rem;
-        border-radius: var(--border-radius);
-        font-weight: 600;
-        border: none;
-        cursor: pointer;
-        transition: all 0.2s ease;
-    }
-    
-    .btn-primary {
-        background: linear-gradient(135deg, var(--accent-green), #38a169);
-        color: white;
-    }
-    
-    .btn-primary:hover {
-        transform: translateY(-1px);
-        box-shadow: var(--shadow);
-    }
-    
-    .btn-danger {
-        background: linear-gradient(135deg, var(--accent-red), #e53e3e);
-        color: white;
-    }
-    
-    .btn-danger:hover {
-        transform: translateY(-1px);
-        box-shadow: var(--shadow);
-    }
-    
-    /* Metric Cards */
-    .metric-card {
-        background: var(--card-bg);
-        padding: 1rem;
-        border-radius: var(--border-radius);
-        border: 1px solid var(--border-color);
-        text-align: center;
-    }
-    
-    .metric-value {
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: var(--text-primary);
-        margin-bottom: 0.25rem;
-    }
-    
-    .metric-label {
-        font-size: 0.75rem;
-        color: var(--text-secondary);
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-    }
-    
-    /* Strategy Tab Styles */
-    .strategy-card {
-        background: var(--secondary-bg);
-        padding: 1.5rem;
-        border-radius: var(--border-radius);
-        border: 1px solid var(--border-color);
-        margin-bottom: 1rem;
-    }
-    
-    .strategy-header {
-        color: var(--text-primary);
-        font-size: 1.2rem;
-        font-weight: 600;
-        margin-bottom: 1rem;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-    
-    .conditions-list {
-        background: var(--card-bg);
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border-left: 4px solid var(--accent-blue);
-    }
-    
-    .conditions-list h4 {
-        color: var(--accent-blue);
-        margin: 0 0 0.5rem 0;
-        font-size: 1rem;
-        font-weight: 600;
-    }
-    
-    .conditions-list ul {
-        margin: 0;
-        padding-left: 1.2rem;
-        color: var(--text-secondary);
-        line-height: 1.6;
-    }
-    
-    .conditions-list li {
-        margin-bottom: 0.25rem;
-    }
-    
-    .status-box {
-        background: var(--card-bg);
-        padding: 1rem;
-        border-radius: 8px;
-        text-align: center;
-        border: 1px solid var(--border-color);
-    }
-    
-    .status-text {
-        font-size: 1.1rem;
-        font-weight: 600;
-        margin-bottom: 0.5rem;
-    }
-    
-    .status-details {
-        font-size: 0.85rem;
-        color: var(--text-secondary);
-    }
-    
-    /* Responsive Design */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding: 1rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Enhanced CSS styling (kept in static/app.css, read once per process)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Enhanced Sidebar
 with st.sidebar:
-    # Header Section
-    st.markdown("""
-    <div class="sidebar-header">
-        <h1>🚀 Trading Platform</h1>
-        <div class="subtitle">Multi-Exchange Trading Dashboard</div>
-    </div>
-    """, unsafe_allow_html=True)
-    
     # Trading Status
     if 'is_trading' not in st.session_state:
         st.session_state['is_trading'] = False
@@ -409,22 +1205,19 @@ with st.sidebar:
         status_text = "📝 PAPER TRADING" if paper_mode else "🚀 LIVE TRADING"
     else:
         status_text = "STOPPED"
-    status_dot = "status-dot"
-    
-    st.markdown(f"""
-    <div class="status-indicator {status_class}">
-        <div class="{status_dot}"></div>
-        {status_text}
-    </div>
-    """, unsafe_allow_html=True)
     
-    # Exchange Configuration
-    st.markdown('<div class="section-header">🔗 Exchange Setup</div>', unsafe_allow_html=True)
+    # Header, trading status and first section header go out as one block
+    st.markdown(
+        SIDEBAR_HEADER_HTML
+        + _STATUS_INDICATOR.substitute(status_class=status_class, status_text=status_text)
+        + section_header_html("🔗 Exchange Setup"),
+        unsafe_allow_html=True
+    )
     
     with st.container():
         ex_name = st.selectbox(
             "Select Exchange", 
-            ["binance", "bybit", "mexc", "alpaca", "coinbase", "kraken"], 
+            EXCHANGES, 
             index=0,
             help="Choose your preferred exchange (crypto or stocks)",
             key="exchange_selector"
@@ -433,10 +1226,7 @@ with st.sidebar:
         st.session_state['selected_exchange'] = ex_name
         
         # Enhanced Backtest Controls
-        st.markdown('<div class="section-header">🧪 Enhanced Backtest</div>', unsafe_allow_html=True)
-        
-        # Initialize enhanced backtester
-        enhanced_bt = EnhancedBacktester()
+        section_header("🧪 Enhanced Backtest")
         
         # Ticker Selection
         ticker_category = st.selectbox(
@@ -446,7 +1236,7 @@ with st.sidebar:
             help="Select the asset category for backtesting"
         )
         
-        available_tickers = enhanced_bt.get_supported_tickers()[ticker_category]
+        available_tickers = get_supported_tickers()[ticker_category]
         selected_ticker = st.selectbox(
             "🎯 Select Ticker",
             available_tickers,
@@ -455,7 +1245,7 @@ with st.sidebar:
         )
         
         # Timeframe Selection
-        available_timeframes = enhanced_bt.get_supported_timeframes()
+        available_timeframes = get_supported_timeframes()
         selected_timeframe = st.selectbox(
             "⏰ Timeframe",
             available_timeframes,
@@ -509,7 +1299,7 @@ with st.sidebar:
             }
 
         # Signal Test
-        st.markdown('<div class="section-header">🔎 Signal Test</div>', unsafe_allow_html=True)
+        section_header("🔎 Signal Test")
         test_sig = st.button("🧪 Test Signals (Buy/Sell)", key="test_signals_btn")
         st.session_state.setdefault('signal_test_trigger', False)
         if test_sig:
@@ -547,85 +1337,52 @@ with st.sidebar:
         )
     
     # Market Configuration
-    st.markdown('<div class="section-header">📊 Market Settings</div>', unsafe_allow_html=True)
+    section_header("📊 Market Settings")
     
     with st.container():
         # Load API from .env when live trading
-        ex_upper = ex_name.upper()
-        api_key = os.getenv(f"{ex_upper}_API_KEY") if not paper else None
-        api_secret = os.getenv(f"{ex_upper}_API_SECRET") if not paper else None
-        
-        # Special handling for Coinbase (requires passphrase)
-        if ex_name.lower() == 'coinbase' and not paper:
-            passphrase = os.getenv(f"{ex_upper}_PASSPHRASE")
-            if api_key and api_secret and passphrase:
-                # For Coinbase, we need to pass the passphrase as well
-                _exec = CCXTExecutor(ex_name, api_key, api_secret, paper=paper)
-                # Set the passphrase in the exchange options
-                if hasattr(_exec.ex, 'options'):
-                    _exec.ex.options['passphrase'] = passphrase
-            else:
-                _exec = CCXTExecutor(ex_name, api_key, api_secret, paper=paper)
-        else:
-            _exec = CCXTExecutor(ex_name, api_key, api_secret, paper=paper)
-        
+        ex_lower = ex_name.lower()
+        api_key = api_secret = passphrase = None
+        if not paper:
+            api_key, api_secret, passphrase = exchange_credentials()[ex_lower]
+            # Special handling for Coinbase (only exchange that requires a passphrase)
+            if ex_lower != 'coinbase' or not (api_key and api_secret):
+                passphrase = None
+
+        # Executor is cached across reruns (one per exchange/mode)
+        _exec = get_executor(ex_name, paper, api_key, api_secret, passphrase)
+
         # Set appropriate quote currency based on exchange
-        if ex_name.lower() in ['alpaca']:
+        if ex_lower in US_STOCK_EXCHANGES:
             # US stock exchanges use USD
             quote_currency = "USD"
-            popular_pairs = [
-                "BTCUSD", "ETHUSD", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA",
-                "NVDA", "META", "NFLX", "AMD", "INTC", "CRM", "ADBE", "PYPL"
-            ]
-        elif ex_name.lower() in ['coinbase', 'kraken']:
+            popular_pairs = POPULAR_ALPACA
+            default_candidates = ("BTCUSD", "BTC/USD")
+        elif ex_lower in US_CRYPTO_EXCHANGES:
             # US crypto exchanges use USD
             quote_currency = "USD"
-            popular_pairs = [
-                "BTC-USD", "ETH-USD", "LTC-USD", "BCH-USD", "ETC-USD",
-                "XRP-USD", "ADA-USD", "DOT-USD", "LINK-USD", "UNI-USD"
-            ]
+            popular_pairs = POPULAR_USD_CRYPTO
+            default_candidates = ("BTC-USD", "BTC/USD")
         else:
             # International crypto exchanges use USDT
             quote_currency = "USDT"
-        popular_pairs = [
-            "BTCUSDT", "ETHUSDT", "BNBUSDT", "ADAUSDT", "SOLUSDT", 
-            "XRPUSDT", "DOTUSDT", "DOGEUSDT", "AVAXUSDT", "MATICUSDT",
-            "LINKUSDT", "UNIUSDT", "LTCUSDT", "ATOMUSDT", "FTMUSDT"
-        ]
+            popular_pairs = POPULAR_USDT
+            default_candidates = ("BTCUSDT", "BTC/USDT")
         
-        symbols = _exec.list_symbols(quote_currency)
-        timeframes = _exec.list_timeframes()
+        try:
+            symbols = get_symbols(_exec, ex_name, paper, quote_currency)
+        except LookupError:
+            symbols = []
+        try:
+            timeframes = get_timeframes(_exec, ex_name, paper)
+        except LookupError:
+            timeframes = []
         
         # Filter available symbols and prioritize popular pairs
-        if symbols:
-            # Convert symbols to uppercase for comparison
-            symbols_upper = [s.upper() for s in symbols]
-            available_popular = [pair for pair in popular_pairs if pair in symbols_upper]
-            other_symbols = [s for s in symbols if s.upper() not in popular_pairs]
-            ordered_symbols = available_popular + other_symbols
-        else:
-            ordered_symbols = popular_pairs
-        
-        # Find index of default symbol based on exchange
-        default_index = 0
-        if ex_name.lower() in ['alpaca']:
-            # Default to BTCUSD for US stock exchanges
-            if "BTCUSD" in ordered_symbols:
-                default_index = ordered_symbols.index("BTCUSD")
-            elif "BTC/USD" in ordered_symbols:
-                default_index = ordered_symbols.index("BTC/USD")
-        elif ex_name.lower() in ['coinbase', 'kraken']:
-            # Default to BTC-USD for US crypto exchanges
-            if "BTC-USD" in ordered_symbols:
-                default_index = ordered_symbols.index("BTC-USD")
-            elif "BTC/USD" in ordered_symbols:
-                default_index = ordered_symbols.index("BTC/USD")
-        else:
-            # Default to BTCUSDT for international crypto exchanges
-            if "BTCUSDT" in ordered_symbols:
-                default_index = ordered_symbols.index("BTCUSDT")
-            elif "BTC/USDT" in ordered_symbols:
-                default_index = ordered_symbols.index("BTC/USDT")
+        ordered_symbols, symbol_index = order_symbols(tuple(symbols) if symbols else popular_pairs, popular_pairs)
+        
+        # Default to the first BTC pair the exchange lists (O(1) index lookups)
+        default_index = next((symbol_index[c] for c in default_candidates if c in symbol_index), 0)
         
         symbol = st.selectbox(
             "Trading Pair", 
@@ -649,22 +1406,28 @@ with st.sidebar:
             step=5,
             help="How often to refresh market data"
         )
+        if st.button("🔄 Refresh Data Now", key="refresh_market_data"):
+            fetch_ohlcv.clear()
         
-        # Automatic periodic refresh using session timestamp
-        # Rerun the app when the chosen refresh interval has elapsed
-        now_ts = time.time()
-        last_ts = st.session_state.get('last_auto_refresh_ts', 0.0)
-        last_interval = st.session_state.get('last_auto_refresh_interval', refresh_secs)
-        # If the interval changed, force a new schedule
-        if last_interval != refresh_secs:
-            st.session_state['last_auto_refresh_interval'] = refresh_secs
-            st.session_state['last_auto_refresh_ts'] = now_ts
-        elif now_ts - last_ts >= float(refresh_secs):
-            st.session_state['last_auto_refresh_ts'] = now_ts
-            st.rerun()
+        if st_autorefresh is not None:
+            # The browser schedules the rerun, so the server never polls or sleeps
+            st_autorefresh(interval=int(refresh_secs * 1000), key='auto_refresh')
+        else:
+            # Automatic periodic refresh using a monotonic session timestamp
+            # (immune to wall-clock adjustments); rerun when the interval has elapsed
+            now_ts = time.monotonic()
+            last_ts = st.session_state.get('last_auto_refresh_ts')
+            last_interval = st.session_state.get('last_auto_refresh_interval', refresh_secs)
+            # If the interval changed (or this is the first run), start a new schedule
+            if last_ts is None or last_interval != refresh_secs:
+                st.session_state['last_auto_refresh_interval'] = refresh_secs
+                st.session_state['last_auto_refresh_ts'] = now_ts
+            elif now_ts - last_ts >= refresh_secs:
+                st.session_state['last_auto_refresh_ts'] = now_ts
+                st.rerun()
     
     # Strategy Configuration
-    st.markdown('<div class="section-header">🎯 Strategy Configuration</div>', unsafe_allow_html=True)
+    section_header("🎯 Strategy Configuration")
     
     with st.container():
         strat_choice = st.selectbox(
@@ -730,10 +1493,17 @@ with st.sidebar:
             wt_channel = 10
             wt_avg = 21
 
+        # Client-weighted settings; the widgets below override them for client_weighted
+        mtf_weight_inputs = {}  # TV timeframe -> weight
+        selected_tfs_client = ['5m', '15m', '1h']
+        entry_threshold = 0.60
         if strat_choice == "client_weighted":
+            # Last saved/loaded settings (session cache; disk is only touched on Save/Load)
+            cw_settings = st.session_state.get("cw_settings", {})
+            cw_weights = cw_settings.get("weights", {})
             entry_threshold = st.slider(
                 "Entry Threshold (weighted score)", 
-                min_value=0.0, max_value=1.0, value=0.60, step=0.05,
+                min_value=0.0, max_value=1.0, value=float(cw_settings.get("entry_threshold", 0.60)), step=0.05,
                 help="Score ≥ threshold triggers BUY"
             )
             st.markdown("**Multi‑Timeframe TV Weights**")
@@ -741,7 +1511,7 @@ with st.sidebar:
             selected_tfs_client = st.multiselect(
                 "Select timeframes to weight",
                 mtf_choices,
-                default=["5m", "15m", "1h"],
+                default=[tf for tf in cw_settings.get("selected_tfs", ["5m", "15m", "1h"]) if tf in mtf_choices],
                 help="TradingView alerts from these timeframes will influence entries"
             )
             mtf_weight_inputs = {}
@@ -750,42 +1520,45 @@ with st.sidebar:
                 with cols[i % len(cols)]:
                     mtf_weight_inputs[tf_sel] = st.slider(
                         f"Weight {tf_sel}", min_value=0.0, max_value=1.0,
-                        value=0.35 if tf_sel=="1h" else (0.25 if tf_sel=="15m" else (0.15 if tf_sel=="5m" else 0.10)),
+                        value=float(cw_weights.get(tf_sel, 0.35 if tf_sel=="1h" else (0.25 if tf_sel=="15m" else (0.15 if tf_sel=="5m" else 0.10)))),
                         step=0.05
                     )
 
             # Persist/Load settings controls
-            from pathlib import Path
-            settings_path = Path("logs/client_weighted_settings.json")
             c1, c2 = st.columns(2)
             with c1:
                 if st.button("💾 Save Settings", key="save_cw_settings"):
-                    settings_path.parent.mkdir(parents=True, exist_ok=True)
-                    import json
-                    with settings_path.open("w", encoding="utf-8") as f:
-                        json.dump({
-                            "entry_threshold": float(entry_threshold),
-                            "selected_tfs": selected_tfs_client,
-                            "weights": mtf_weight_inputs,
-                        }, f)
+                    cw_settings = {
+                        "entry_threshold": float(entry_threshold),
+                        "selected_tfs": selected_tfs_client,
+                        "weights": mtf_weight_inputs,
+                    }
+                    os.makedirs(os.path.dirname(CW_SETTINGS_PATH), exist_ok=True)
+                    with open(CW_SETTINGS_PATH, "w", encoding="utf-8") as f:
+                        json.dump(cw_settings, f)
+                    st.session_state["cw_settings"] = cw_settings
                     st.success("Settings saved")
             with c2:
-                if st.button("📥 Load Settings", key="load_cw_settings") and settings_path.exists():
-                    import json
+                if st.button("📥 Load Settings", key="load_cw_settings"):
                     try:
-                        data = json.loads(settings_path.read_text(encoding="utf-8"))
+                        with open(CW_SETTINGS_PATH, "r", encoding="utf-8") as f:
+                            data = json.load(f)
                         entry_threshold = float(data.get("entry_threshold", entry_threshold))
                         selected_tfs_client = data.get("selected_tfs", selected_tfs_client)
                         mtf_weight_inputs = {k: float(v) for k, v in (data.get("weights", mtf_weight_inputs)).items()}
-                        st.session_state["cw_loaded_threshold"] = entry_threshold
-                        st.session_state["cw_loaded_tfs"] = selected_tfs_client
-                        st.session_state["cw_loaded_weights"] = mtf_weight_inputs
+                        st.session_state["cw_settings"] = {
+                            "entry_threshold": entry_threshold,
+                            "selected_tfs": selected_tfs_client,
+                            "weights": mtf_weight_inputs,
+                        }
                         st.success("Settings loaded")
+                    except FileNotFoundError:
+                        st.warning("No saved settings found")
                     except Exception as e:
                         st.error(f"Load failed: {e}")
     
     # Multi-Timeframe Analysis Configuration
-    st.markdown('<div class="section-header">📊 Multi-Timeframe Analysis</div>', unsafe_allow_html=True)
+    section_header("📊 Multi-Timeframe Analysis")
     
     with st.expander("🔄 Multi-Timeframe Settings", expanded=False):
         enable_mtf = st.checkbox(
@@ -819,7 +1592,7 @@ with st.sidebar:
             )
             
             # Initialize multi-timeframe analyzer
-            mtf_analyzer = MultiTimeframeAnalyzer()
+            mtf_analyzer = _MultiTimeframeAnalyzer()()
             
             mtf_min_strength = st.selectbox(
                 "Minimum Strength",
@@ -848,165 +1621,58 @@ with st.sidebar:
             tf_weights = {}
     
     # Risk Management
-    st.markdown('<div class="section-header">⚠️ Risk Management</div>', unsafe_allow_html=True)
+    section_header("⚠️ Risk Management")
     
     with st.container():
         initial_cap = st.number_input(
             "💰 Initial Capital ($)", 
             min_value=100.0, 
-            max_value=1000000.0, 
-            value=10000.0,
-            help="Starting capital for trading"
-        )
-        
-        if 'initial_capital' not in st.session_state:
-            st.session_state['initial_capital'] = initial_cap
-        
-        risk_per_trade = st.slider(
-            "Risk per Trade (%)", 
-            min_value=0.005, 
-            max_value=0.10, 
-            value=0.02, 
-            step=0.005,
-            help="Percentage of capital to risk per trade"
-        )
-        
-    # Advanced Risk Management Configuration
-    st.markdown('<div class="section-header">⚙️ Advanced Risk Management</div>', unsafe_allow_html=True)
-    
-    with st.expander("🔧 Configurable Stop-Loss Settings", expanded=False):
-        stop_loss_type = st.selectbox(
-            "Stop Loss Type",
-            ["percentage", "atr", "support_resistance", "volatility"],
-            index=0,
-            help="Choose stop loss calculation method"
-        )
-        
-        if stop_loss_type == "percentage":
-            stop_loss_value = st.slider(
-                "Stop Loss Percentage",
-                min_value=0.5,
-                max_value=10.0,
-                value=2.0,
-                step=0.1,
-                format="%.1f%%",
-                help="Stop loss as percentage of entry price"
-            ) / 100
-        elif stop_loss_type == "atr":
-            stop_loss_value = st.slider(
-                "ATR Multiplier",
-                min_value=0.5,
-                max_value=5.0,
-                value=2.0,
-                step=0.1,
-                help="ATR multiplier for stop loss distance"
-            )
-        elif stop_loss_type == "support_resistance":
-            stop_loss_value = st.slider(
-                "Support/Resistance Distance",
-                min_value=1.0,
-                max_value=5.0,
-                value=2.0,
-                step=0.1,
-                format="%.1f%%",
-                help="Distance from support/resistance levels"
-            ) / 100
-        else:  # volatility
-            stop_loss_value = st.slider(
-                "Volatility Multiplier",
-                min_value=1.0,
-                max_value=3.0,
-                value=2.0,
-                step=0.1,
-                help="Volatility multiplier for stop loss"
-            )
-        
-        # TP1/TP2/Runner Configuration
-        st.markdown("**Take Profit Configuration**")
-        tp1_multiplier = st.slider(
-            "TP1 Multiplier",
-            min_value=1.0,
-            max_value=3.0,
-            value=1.5,
-            step=0.1,
-            help="TP1 as multiple of risk"
-        )
-        
-        tp2_multiplier = st.slider(
-            "TP2 Multiplier", 
-            min_value=2.0,
-            max_value=5.0,
-            value=2.0,
-            step=0.1,
-            help="TP2 as multiple of risk"
-        )
-        
-        runner_multiplier = st.slider(
-            "Runner Multiplier",
-            min_value=3.0,
-            max_value=10.0,
-            value=3.0,
-            step=0.1,
-            help="Runner activation as multiple of risk"
-        )
-        
-        # Daily Breaker
-        daily_breaker_active = st.checkbox(
-            "Enable Daily Breaker",
-            value=False,
-            help="Stop trading after daily loss limit"
-        )
-        
-        if daily_breaker_active:
-            daily_loss_limit = st.slider(
-                "Daily Loss Limit",
-                min_value=1.0,
-                max_value=10.0,
-                value=5.0,
-                step=0.5,
-                format="%.1f%%",
-                help="Maximum daily loss as percentage of capital"
-            ) / 100
-        else:
-            daily_loss_limit = 0.05
+            max_value=1000000.0, 
+            value=10000.0,
+            help="Starting capital for trading"
+        )
         
-        # Additional Risk Parameters
-        st.markdown("**Additional Risk Parameters**")
-        max_bars_in_trade = st.number_input(
-            "Max Bars in Trade", 
-            min_value=1, 
-            max_value=10000, 
-            value=100,
-            help="Maximum number of bars to hold a position"
+        if 'initial_capital' not in st.session_state:
+            st.session_state['initial_capital'] = initial_cap
+        
+        risk_per_trade = st.slider(
+            "Risk per Trade (%)", 
+            min_value=0.005, 
+            max_value=0.10, 
+            value=0.02, 
+            step=0.005,
+            help="Percentage of capital to risk per trade"
         )
         
-        # Legacy parameters for backward compatibility
-        stop_loss_pct = stop_loss_value if stop_loss_type == "percentage" else 0.03
-        take_profit_pct = tp1_multiplier * stop_loss_pct if stop_loss_type == "percentage" else 0.06
+    # Advanced Risk Management Configuration
+    section_header("⚙️ Advanced Risk Management")
+    
+    risk_settings = render_risk_settings()
+    stop_loss_type = risk_settings['stop_loss_type']
+    stop_loss_value = risk_settings['stop_loss_value']
+    tp1_multiplier = risk_settings['tp1_multiplier']
+    tp2_multiplier = risk_settings['tp2_multiplier']
+    runner_multiplier = risk_settings['runner_multiplier']
+    daily_breaker_active = risk_settings['daily_breaker_active']
+    daily_loss_limit = risk_settings['daily_loss_limit']
+    max_bars_in_trade = risk_settings['max_bars_in_trade']
+    
+    # Legacy parameters for backward compatibility
+    stop_loss_pct = stop_loss_value if stop_loss_type == "percentage" else 0.03
+    take_profit_pct = tp1_multiplier * stop_loss_pct if stop_loss_type == "percentage" else 0.06
     
     # Initialize session state
-    if 'account' not in st.session_state:
-        st.session_state['account'] = {'cash': float(initial_cap), 'equity': [float(initial_cap)]}
-    if 'position' not in st.session_state:
-        st.session_state['position'] = None
-    if 'trades' not in st.session_state:
-        st.session_state['trades'] = []
-    if 'arb_running' not in st.session_state:
-        st.session_state['arb_running'] = False
-    if 'real_account_data' not in st.session_state:
-        st.session_state['real_account_data'] = None
-    if 'account_validation' not in st.session_state:
-        st.session_state['account_validation'] = None
+    init_session_state(initial_cap)
     
     # Real Account Data Fetching and Validation
     if not paper and api_key and api_secret:
-        st.markdown('<div class="section-header">🔐 Account Validation</div>', unsafe_allow_html=True)
+        section_header("🔐 Account Validation")
         
         # Validate account access
         if st.button("🔍 Validate Account Access", key="validate_account"):
             with st.spinner("Validating account access..."):
                 try:
-                    validation_result = _exec.validate_account()
+                    validation_result = validate_account(_exec, ex_name, paper)
                     st.session_state['account_validation'] = validation_result
                     
                     if validation_result['valid']:
@@ -1018,20 +1684,14 @@ with st.sidebar:
                         
                         # Show suggestions if available
                         suggestions = error_handler.get_error_suggestions(Exception(validation_result['message']))
-                        if suggestions:
-                            st.markdown("**💡 Suggestions:**")
-                            for suggestion in suggestions:
-                                st.markdown(f"• {suggestion}")
+                        show_suggestions(suggestions)
                 except Exception as e:
                     error_msg = error_handler.get_user_friendly_message(e)
                     st.error(error_msg)
                     
                     # Show suggestions
                     suggestions = error_handler.get_error_suggestions(e)
-                    if suggestions:
-                        st.markdown("**💡 Suggestions:**")
-                        for suggestion in suggestions:
-                            st.markdown(f"• {suggestion}")
+                    show_suggestions(suggestions)
         
         # Display validation results
         if st.session_state['account_validation']:
@@ -1053,7 +1713,7 @@ with st.sidebar:
         if st.button("📊 Fetch Real Account Data", key="fetch_account_data"):
             with st.spinner("Fetching real account data..."):
                 try:
-                    account_data = _exec.get_account_info()
+                    account_data = fetch_account_info(_exec, ex_name, paper)
                     st.session_state['real_account_data'] = account_data
                     st.success("✅ Real account data fetched successfully!")
                 except Exception as e:
@@ -1062,92 +1722,16 @@ with st.sidebar:
                     
                     # Show suggestions
                     suggestions = error_handler.get_error_suggestions(e)
-                    if suggestions:
-                        st.markdown("**💡 Suggestions:**")
-                        for suggestion in suggestions:
-                            st.markdown(f"• {suggestion}")
+                    show_suggestions(suggestions)
         
         # Always show balance - automatic display
         st.markdown(display_account_balance(paper, st.session_state.get('real_account_data')), unsafe_allow_html=True)
         
         # Display real account data
-        if st.session_state['real_account_data']:
-            real_data = st.session_state['real_account_data']
-            
-            # Real Positions Display
-            if real_data.get('positions'):
-                positions = real_data['positions']
-                if positions:
-                    st.markdown(f"""
-                    <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; border: 1px solid var(--border-color); margin: 1rem 0;">
-                        <h4 style="margin: 0 0 1rem 0; color: var(--text-primary);">📈 Real Positions ({len(positions)})</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    for pos in positions[:5]:  # Show first 5 positions
-                        symbol = pos.get('symbol', 'Unknown')
-                        size = pos.get('size', 0)
-                        side = pos.get('side', 'Unknown')
-                        unrealized_pnl = pos.get('unrealizedPnl', 0)
-                        pnl_color = "var(--accent-green)" if float(unrealized_pnl) >= 0 else "var(--accent-red)"
-                        
-                        st.markdown(f"""
-                        <div style="background: var(--secondary-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0; border-left: 4px solid {pnl_color};">
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <span style="color: var(--text-primary); font-weight: 600;">{symbol}</span>
-                                <span style="color: {pnl_color}; font-weight: 600;">${float(unrealized_pnl):,.2f}</span>
-                            </div>
-                            <div style="color: var(--text-secondary); font-size: 0.9rem;">
-                                {side} • Size: {size}
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.markdown("""
-                    <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; border: 1px solid var(--border-color); margin: 1rem 0; text-align: center;">
-                        <h4 style="margin: 0 0 0.5rem 0; color: var(--text-primary);">📈 Real Positions</h4>
-                        <p style="color: var(--text-secondary); margin: 0;">No open positions</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # Real Orders Display
-            if real_data.get('orders'):
-                orders = real_data['orders']
-                if orders:
-                    st.markdown(f"""
-                    <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; border: 1px solid var(--border-color); margin: 1rem 0;">
-                        <h4 style="margin: 0 0 1rem 0; color: var(--text-primary);">📋 Real Orders ({len(orders)})</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    for order in orders[:5]:  # Show first 5 orders
-                        order_id = order.get('orderId', 'Unknown')
-                        symbol = order.get('symbol', 'Unknown')
-                        side = order.get('side', 'Unknown')
-                        qty = order.get('qty', 0)
-                        status = order.get('orderStatus', 'Unknown')
-                        
-                        st.markdown(f"""
-                        <div style="background: var(--secondary-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0;">
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <span style="color: var(--text-primary); font-weight: 600;">{symbol}</span>
-                                <span style="color: var(--text-secondary); font-size: 0.9rem;">{status}</span>
-                            </div>
-                            <div style="color: var(--text-secondary); font-size: 0.9rem;">
-                                {side} • Qty: {qty} • ID: {order_id[:8]}...
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    st.markdown("""
-                    <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; border: 1px solid var(--border-color); margin: 1rem 0; text-align: center;">
-                        <h4 style="margin: 0 0 0.5rem 0; color: var(--text-primary);">📋 Real Orders</h4>
-                        <p style="color: var(--text-secondary); margin: 0;">No open orders</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+        render_real_account(st.session_state['real_account_data'])
 
     # Trading Controls
-    st.markdown('<div class="section-header">🎮 Trading Controls</div>', unsafe_allow_html=True)
+    section_header("🎮 Trading Controls")
     
     # Mode-specific warnings and controls
     if paper:
@@ -1215,13 +1799,15 @@ with st.sidebar:
         stop_text = "⏹️ Stop Trading" if paper else "⏹️ EMERGENCY STOP"
         if st.button(stop_text, disabled=not st.session_state['is_trading'], key="stop_trading"):
             st.session_state['is_trading'] = False
+            # Write out the equity rows still queued for the batched CSV
+            flush_pnl()
             if paper:
                 st.warning("📝 Paper trading stopped!")
             else:
                 st.warning("🛑 REAL TRADING STOPPED - All positions closed!")
     
     # Arbitrage Scanner
-    st.markdown('<div class="section-header">🔍 Arbitrage Scanner</div>', unsafe_allow_html=True)
+    section_header("🔍 Arbitrage Scanner")
     
     arb_enabled = st.toggle(
         "Enable Arbitrage Scanner", 
@@ -1257,14 +1843,8 @@ with st.sidebar:
         pnl = 0.0  # Will be calculated in main section
         pnl_color = "#48bb78" if pnl >= 0 else "#f56565"
         
-        st.markdown(f"""
-        <div style="background: var(--secondary-bg); padding: 1rem; border-radius: 8px; 
-                    border: 1px solid var(--border-color); margin: 1rem 0; text-align: center;">
-            <div style="font-size: 0.9rem; color: var(--text-secondary); margin-bottom: 0.5rem;">Active Position</div>
-            <div style="font-size: 1.5rem; font-weight: 700; color: {pnl_color};">${pnl:,.2f}</div>
-            <div style="font-size: 0.8rem; color: var(--text-secondary);">Unrealized P&L</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SIDEBAR_POSITION_CARD.substitute(pnl_color=pnl_color, pnl=f"{pnl:,.2f}"),
+                    unsafe_allow_html=True)
 
 # Main Dashboard Header
 st.markdown("""
@@ -1283,8 +1863,8 @@ st.markdown("""
 # Data Processing Section
 with st.spinner("🔄 Loading market data..."):
     try:
-        # Fetch OHLCV
-        df = _exec.fetch_ohlcv_df(symbol, timeframe=timeframe, limit=500)
+        # Fetch OHLCV (cached for the current refresh interval)
+        df = fetch_ohlcv(_exec, ex_name, paper, symbol, timeframe, 500, int(time.time() // refresh_secs))
         
         # Validate required columns
         required_columns = ['timestamp', 'open', 'high', 'low', 'close']
@@ -1303,7 +1883,6 @@ with st.spinner("🔄 Loading market data..."):
             st.session_state['signal_test_trigger'] = False
             with st.spinner("Testing signals..."):
                 try:
-                    from indicators.weighted_signals import generate_weighted_signals
                     sig = generate_weighted_signals(df).astype(bool)
                     df['signal'] = sig
                     buy_count = int(sig.sum())
@@ -1313,72 +1892,54 @@ with st.spinner("🔄 Loading market data..."):
                 except Exception as e:
                     st.error(f"Signal test failed: {e}")
         
-        # Indicators & signals
-        df['rsi'] = rsi(df['close'], length=int(rsi_length))
-        
-        # Add EMA indicators for image-style chart
-        df['ema20'] = df['close'].ewm(span=20, adjust=False).mean()
-        df['ema50'] = df['close'].ewm(span=50, adjust=False).mean()
-        df['ema200'] = df['close'].ewm(span=200, adjust=False).mean()
-        
-        # For Pine script compatibility
-        df['ema_fast'] = df['ema50']
-        df['ema_slow'] = df['ema200']
-        
-        # Add Stochastic indicator
-        df['stoch'] = stochastic(df['high'], df['low'], df['close'], length=14)
+        # Indicators & signals (memoized on the OHLC fingerprint, see compute_indicators)
+        df = compute_indicators(df, int(rsi_length), int(wt_channel), int(wt_avg))
         
-        # Add Parabolic SAR indicator
-        df['sar'] = parabolic_sar(df['high'], df['low'], df['close'], 
-                                   af_start=0.02, af_increment=0.02, af_max=0.2)
-        
-        # Calculate hlc3 if columns exist
-        if set(['high', 'low', 'close']).issubset(df.columns):
-            df['hlc3'] = (df['high'] + df['low'] + df['close']) / 3.0
-            wt_input = df['hlc3']
-        else:
-            wt_input = df['close']
-        
-        # Compute wavetrend and ensure correct assignment
-        wt = wavetrend(wt_input, channel_length=int(wt_channel), average_length=int(wt_avg))
-        if isinstance(wt, pd.DataFrame):
-            df[['wt1', 'wt2']] = wt[['wt1', 'wt2']]
-        elif isinstance(wt, (list, tuple)) and len(wt) == 2:
-            df['wt1'], df['wt2'] = wt
-        else:
-            raise ValueError("wavetrend function returned unexpected output format")
+        # Load TradingView webhook signals once per run (reused by the client_weighted aggregator)
+        tv_signals = get_tv_signals()
+        df_sig_all = tv_signals
         
-        # Load TradingView webhook signals
-        df_sig_all = fetch_recent_signals_http(limit=500)
-        if df_sig_all.empty:
-            df_sig_all = load_tradingview_signals()
+        # Bar times as int64 UTC keys, computed once for every signal join below
+        bar_keys = utc_ns_key(df['timestamp']).to_numpy()
         
         # Map webhook signals to dataframe
         if not df_sig_all.empty and 'timestamp' in df_sig_all.columns:
-            # Convert timestamp column
-            df_sig_all['timestamp'] = pd.to_datetime(df_sig_all['timestamp'])
+            # Backward as-of join on int64 UTC-nanosecond keys: each bar takes the latest
+            # signal at or before it. df is already sorted above and the signal stores are
+            # append-only, so sort only if the invariant is broken
+            sig_ts = pd.to_datetime(df_sig_all['timestamp'], utc=True)
+            valid = sig_ts.notna()
+            df_sig_all = df_sig_all.loc[valid]
+            sig_keys = utc_ns_key(sig_ts[valid]).to_numpy()
+            if len(sig_keys) > 1 and (np.diff(sig_keys) < 0).any():
+                order = np.argsort(sig_keys, kind='stable')
+                sig_keys = sig_keys[order]
+                df_sig_all = df_sig_all.iloc[order]
+            
+            # Webhook signal is True when side is 'buy' (side is a lower-cased categorical);
+            # only that flag is joined onto df, not the whole signal frame
+            if 'side' in df_sig_all.columns:
+                sig_buy = (df_sig_all['side'] == 'buy').to_numpy()
+            elif 'signal' in df_sig_all.columns:
+                sig_buy = df_sig_all['signal'].fillna(False).astype(bool).to_numpy()
+            else:
+                sig_buy = None
             
-            # Merge webhook signals with main dataframe (both must be sorted by timestamp)
-            df_sorted = df.sort_values('timestamp').copy()
-            df_sig_sorted = df_sig_all.sort_values('timestamp').copy()
-            df = pd.merge_asof(df_sorted, df_sig_sorted, on='timestamp', direction='backward', suffixes=('', '_webhook'))
-            # Create webhook column from TradingView signals
-            if 'side' in df.columns:
-                # Webhook signal is True when side is 'buy'
-                df['webhook'] = (df['side'].str.lower() == 'buy').fillna(False).astype(bool)
-            elif 'signal' in df.columns:
-                df['webhook'] = df['signal'].fillna(False).astype(bool)
+            if sig_buy is not None and len(sig_keys):
+                idx = np.searchsorted(sig_keys, bar_keys, side='right') - 1
+                df['webhook'] = (idx >= 0) & sig_buy[np.maximum(idx, 0)]
             else:
                 df['webhook'] = False
         else:
             df['webhook'] = False
         
-        sm = StrategyManager()
+        # Only the non-'auto' strategies go through the manager
+        sm = _StrategyManager()() if strat_choice != 'auto' else None
         
         # Generate signals using TradingView Webhook + RSI + WaveTrend combo
         if strat_choice == 'auto':
             # Use TradingTriggerEngine for final_buy/final_sell signals
-            trigger_engine = TradingTriggerEngine()
+            trigger_engine = _TradingTriggerEngine()()
             signals_dict = trigger_engine.generate_combined_signals(
                 df,
                 wt_channel_length=int(wt_channel),
@@ -1391,27 +1952,14 @@ with st.spinner("🔄 Loading market data..."):
                 show_intermediate=True
             )
             
-            # Assign final signals
-            df['final_buy'] = signals_dict['final_buy']
-            df['final_sell'] = signals_dict['final_sell']
-            
-            # Also keep intermediate signals for display
-            if 'wt_buy' in signals_dict:
-                df['wt_buy'] = signals_dict['wt_buy']
-            if 'wt_sell' in signals_dict:
-                df['wt_sell'] = signals_dict['wt_sell']
-            if 'momentum_buy' in signals_dict:
-                df['momentum_buy'] = signals_dict['momentum_buy']
-            if 'momentum_sell' in signals_dict:
-                df['momentum_sell'] = signals_dict['momentum_sell']
-            if 'rsi_buy' in signals_dict:
-                df['rsi_buy'] = signals_dict['rsi_buy']
-            if 'rsi_sell' in signals_dict:
-                df['rsi_sell'] = signals_dict['rsi_sell']
-            
-            # For backward compatibility
-            df['signal'] = df['final_buy']
-            df['sell_signal'] = df['final_sell']
+            # Final and intermediate (display) signals, plus the backward-compatible
+            # signal/sell_signal aliases, added in one assign instead of one insert each
+            df = df.assign(
+                **{k: signals_dict[k] for k in TRIGGER_SIGNAL_COLUMNS if k in signals_dict},
+                signal=signals_dict['final_buy'],
+                sell_signal=signals_dict['final_sell'],
+                trigger_name=trigger_names(signals_dict),
+            )
         elif strat_choice == 'ema_crossover':
             return_mode = 'long_short' if position_mode == 'Long + Short' else 'long_only'
             sig_df = sm.strategies['ema_crossover'].generate_signals(df, return_mode=return_mode)
@@ -1425,47 +1973,40 @@ with st.spinner("🔄 Loading market data..."):
             df['signal'] = sm.strategies['grid'].generate_signals(df)
         elif strat_choice == 'client_weighted':
             # ---------------- TV multi-timeframe aggregator (lightweight) ----------------
-            # Pull recent alerts (HTTP realtime server) then fall back to file store
-            df_sig_all = fetch_recent_signals_http(limit=500)
-            if df_sig_all.empty:
-                df_sig_all = load_tradingview_signals()
-
-            def _norm_tf(tf: str) -> str:
-                tf = str(tf or '').upper()
-                mapping = {
-                    '1':'1m','3':'3m','5':'5m','10':'10m','15':'15m','20':'20m','30':'30m',
-                    '60':'1h','120':'2h','180':'3h','240':'4h','360':'6h','480':'8h','720':'12h',
-                    'D':'1d','2D':'2d','3D':'3d','5D':'5d','W':'1w','2W':'2w','3W':'3w','M':'1M'
-                }
-                return mapping.get(tf, tf.lower())
+            # Recent alerts loaded above (HTTP realtime server, then file store)
+            df_sig_all = tv_signals
+
+            # Timed 'buy' alerts, selected with one mask and shared by every flag below;
+            # 'timestamp' was parsed (UTC) from 'time'/'received_at' by the loaders.
+            # buy_idx is the first bar on or after each alert (df is sorted), found with a
+            # single int64 binary search; each flag then only filters it by timeframe code.
+            buy_idx = np.empty(0, dtype=np.intp)
+            buy_tf_codes = None
+            tf_code = {}
+            if not df_sig_all.empty and 'timestamp' in df_sig_all.columns:
+                buy_mask = df_sig_all['timestamp'].notna()
+                if 'side' in df_sig_all.columns:
+                    buy_mask &= df_sig_all['side'] == 'buy'
+                buy_keys = utc_ns_key(df_sig_all.loc[buy_mask, 'timestamp']).to_numpy()
+                buy_idx = np.searchsorted(bar_keys, buy_keys, side='left')
+                if 'tf_norm' in df_sig_all.columns:
+                    buy_tf = df_sig_all.loc[buy_mask, 'tf_norm'].astype('category')
+                    buy_tf_codes = buy_tf.cat.codes.to_numpy()
+                    tf_code = {label: code for code, label in enumerate(buy_tf.cat.categories)}
 
             def _add_flag(label: str, col: str):
-                if df_sig_all.empty or 'time' not in df_sig_all.columns and 'received_at' not in df_sig_all.columns:
-                    return
-                tcol = 'time' if 'time' in df_sig_all.columns else 'received_at'
-                sub = df_sig_all.copy()
-                sub['timestamp'] = pd.to_datetime(sub[tcol])
-                if 'side' in sub.columns:
-                    sub = sub[sub['side'].str.lower()=='buy']
-                if 'timeframe' in sub.columns:
-                    sub = sub[_norm_tf(sub['timeframe']).astype(str)==label]
-                # Initialize column
-                df[col] = False
-                if sub.empty:
-                    return
-                # mark on or after signal time
-                ts = pd.to_datetime(df['timestamp'])
-                for ts_sig in sub['timestamp']:
-                    idx = ts.searchsorted(ts_sig, side='left')
-                    if 0 <= idx < len(df):
-                        df.at[df.index[idx], col] = True
+                if buy_tf_codes is None:
+                    idx = buy_idx
+                else:
+                    idx = buy_idx[buy_tf_codes == tf_code.get(label, -2)]
+                # Build the whole column before a single assignment
+                flags = np.zeros(len(df), dtype=bool)
+                flags[idx[idx < len(df)]] = True
+                df[col] = flags
 
             # Create timeframe flags based on selection
-            tfs_for_flags = []
-            if 'selected_tfs_client' in locals() and isinstance(selected_tfs_client, list):
-                tfs_for_flags = selected_tfs_client
-            else:
-                tfs_for_flags = ['5m','15m','1h']
+            # Loaded settings come from JSON, so the selection may not be a list
+            tfs_for_flags = selected_tfs_client if isinstance(selected_tfs_client, list) else ['5m', '15m', '1h']
 
             for tf_lab in tfs_for_flags:
                 _add_flag(tf_lab, f"tv_buy_{tf_lab}")
@@ -1473,10 +2014,7 @@ with st.spinner("🔄 Loading market data..."):
             _add_flag(str(timeframe).lower(), 'tv_buy')
 
             # Build weights dict from UI selections
-            mtf_weights = {}
-            if 'mtf_weight_inputs' in locals():
-                for tf_lab, w in mtf_weight_inputs.items():
-                    mtf_weights[f"tv_buy_{tf_lab}"] = float(w)
+            mtf_weights = {f"tv_buy_{tf_lab}": float(w) for tf_lab, w in mtf_weight_inputs.items()}
 
             df['signal'] = sm.strategies['client_weighted'].generate_signals(
                 df,
@@ -1485,33 +2023,17 @@ with st.spinner("🔄 Loading market data..."):
                 rsi_sell_threshold=float(rsi_oversold),
                 wt_channel_length=int(wt_channel),
                 wt_average_length=int(wt_avg),
-                entry_threshold=float(entry_threshold if 'entry_threshold' in locals() else 0.60),
+                entry_threshold=float(entry_threshold),
                 mtf_tv_weights=mtf_weights,
             )
         else:
             # Fallback to auto strategy
-            rsi_oversold_condition = df['rsi'] < rsi_oversold
-            wt_cross_up = (df['wt1'].shift(1) <= df['wt2'].shift(1)) & (df['wt1'] > df['wt2'])
-            df['signal'] = rsi_oversold_condition & wt_cross_up
-        
-        # Market Overview Section
-        last_close = float(df['close'].iat[-1]) if len(df) else 0.0
-        prev_close = float(df['close'].iat[-2]) if len(df) > 1 else last_close
-
-        # Calculate 24h change (last 24 bars for hourly data, or adjust based on timeframe)
-        if len(df) >= 24:
-            price_24h_ago = float(df['close'].iat[-24])
-            price_change_24h = last_close - price_24h_ago
-            price_change_24h_pct = (price_change_24h / price_24h_ago * 100) if price_24h_ago else 0
-        else:
-            # Fallback to previous bar if not enough data
-            price_change_24h = last_close - prev_close
-            price_change_24h_pct = (price_change_24h / prev_close * 100) if prev_close else 0
-
-        # Current bar change
-        price_change = last_close - prev_close
-        price_change_pct = (price_change / prev_close * 100) if prev_close else 0
-        up = price_change_24h >= 0
+            # wt1 crosses above wt2 at bar i (never on the first bar), on raw arrays
+            w1 = df['wt1'].to_numpy()
+            w2 = df['wt2'].to_numpy()
+            wt_cross_up = np.zeros(len(df), dtype=bool)
+            wt_cross_up[1:] = (w1[:-1] <= w2[:-1]) & (w1[1:] > w2[1:])
+            df['signal'] = (df['rsi'].to_numpy() < rsi_oversold) & wt_cross_up
         
         st.success("✅ Market data loaded successfully!")
 
@@ -1539,13 +2061,22 @@ if 'df' not in locals() or df is None or len(df) == 0:
     st.error("❌ No market data available. Please check your exchange settings and try again.")
     st.stop()
 
+# Column arrays for the overview, KPI cards and sparklines: index ndarrays, not
+# Series. Taken in one float64 block extraction rather than one call per column
+# (rsi is stored as float32; the upcast is exact).
+_has_volume = 'volume' in df.columns
+close_arr, high_arr, low_arr, rsi_arr, wt1_arr, wt2_arr, *_vol = df[
+    ['close', 'high', 'low', 'rsi', 'wt1', 'wt2'] + (['volume'] if _has_volume else [])
+].to_numpy(dtype=np.float64).T
+vol_arr = _vol[0] if _has_volume else None
+
 # Market Overview Section
-last_close = float(df['close'].iat[-1]) if len(df) else 0.0
-prev_close = float(df['close'].iat[-2]) if len(df) > 1 else last_close
+last_close = float(close_arr[-1]) if len(df) else 0.0
+prev_close = float(close_arr[-2]) if len(df) > 1 else last_close
 
 # Calculate 24h change (last 24 bars for hourly data, or adjust based on timeframe)
 if len(df) >= 24:
-    price_24h_ago = float(df['close'].iat[-24])
+    price_24h_ago = float(close_arr[-24])
     price_change_24h = last_close - price_24h_ago
     price_change_24h_pct = (price_change_24h / price_24h_ago * 100) if price_24h_ago else 0
 else:
@@ -1568,7 +2099,7 @@ st.markdown(f"""
                 📈 {symbol} • {ex_name.upper()}
             </h2>
             <p style="margin: 0.25rem 0 0 0; color: var(--text-secondary); font-size: 0.95rem;">
-                {timeframe} • Last updated: {pd.Timestamp.now().strftime('%H:%M:%S')}
+                {timeframe} • Last updated: {datetime.now().strftime('%H:%M:%S')}
             </p>
         </div>
         <div style="text-align: right;">
@@ -1606,42 +2137,28 @@ st.markdown("""
     </div>
 """.format(timeframe), unsafe_allow_html=True)
 
-# Real-time chart with lightweight-charts (full width)
-with st.container():
-    # Lightweight Charts panel with real-time TV signal markers
-    ohlc = []
-    base_df = df.copy() if 'df' in locals() else pd.DataFrame()
-    if base_df is None or base_df.empty or not set(['timestamp','open','high','low','close']).issubset(base_df.columns):
-        # Fallback: fetch OHLC from yfinance for display
-        def _yf_params(tf: str, days: int = 7):
-            tf = str(tf).lower()
-            if tf == '1m': return ("1d","1m")
-            if tf == '5m': return ("7d","5m")
-            if tf == '15m': return ("30d","15m")
-            if tf == '1h': return ("60d","60m")
-            if tf == '4h': return ("730d","240m")
-            return ("1y","1d")
-        yf_symbol = to_yfinance_symbol(ex_name, symbol)
-        p,i = _yf_params(str(timeframe))
-        try:
-            tmp = yf.download(yf_symbol, period=p, interval=i, progress=False)
-            if not tmp.empty:
-                base_df = tmp.reset_index().rename(columns={'Date':'timestamp','Datetime':'timestamp','Open':'open','High':'high','Low':'low','Close':'close'})
-        except Exception:
-            base_df = pd.DataFrame()
-
-    if not base_df.empty:
-        # time in seconds for lightweight-charts
-        ohlc = [
-            {
-                'time': int(pd.Timestamp(ts).timestamp()),
-                'open': float(o), 'high': float(h), 'low': float(l), 'close': float(c)
-            }
-            for ts, o, h, l, c in zip(base_df['timestamp'], base_df['open'], base_df['high'], base_df['low'], base_df['close'])
-        ]
-    lwc_data_json = json.dumps(ohlc)
-    import base64 as _b64
-    lwc_data_b64 = _b64.b64encode(lwc_data_json.encode('utf-8')).decode('ascii')
+# Real-time chart with lightweight-charts (full width). The panel is disabled (see
+# below), so its OHLC payload is only built when LWC_ENABLED is switched back on.
+if LWC_ENABLED:
+    with st.container():
+        # Lightweight Charts panel with real-time TV signal markers
+        ohlc = {'time': [], 'open': [], 'high': [], 'low': [], 'close': []}
+        base_df = df if 'df' in locals() else pd.DataFrame()  # read-only below, no copy needed
+        if base_df is None or base_df.empty or not set(['timestamp','open','high','low','close']).issubset(base_df.columns):
+            # Fallback: fetch OHLC from yfinance for display
+            try:
+                base_df = fetch_yf_ohlc(ex_name, symbol, str(timeframe))
+            except Exception:
+                base_df = pd.DataFrame()
+
+        if not base_df.empty:
+            # Struct-of-arrays payload (time in seconds for lightweight-charts); the
+            # client zips it back into bars:
+            #   ohlc.time.map((t, i) => ({time: t, open: ohlc.open[i], high: ohlc.high[i], low: ohlc.low[i], close: ohlc.close[i]}))
+            ohlc['time'] = (utc_ns_key(base_df['timestamp']).to_numpy() // 10**9).tolist()
+            for col in ('open', 'high', 'low', 'close'):
+                ohlc[col] = base_df[col].to_numpy(dtype=np.float64).tolist()
+        lwc_data_b64 = base64.b64encode(json.dumps(ohlc).encode('utf-8')).decode('ascii')
 
 # Lightweight Charts disabled - fails in Streamlit sandboxed iframe
 # Using Plotly chart below instead
@@ -1652,7 +2169,7 @@ with st.container():
 show_volume = False  # Volume indicator disabled as requested
 
 # Create premium TradingView-style chart using chart_builder module
-fig = create_premium_chart(df, symbol, show_volume=show_volume)
+fig = premium_chart(df, symbol, show_volume=show_volume)
 chart_config = get_chart_config()
 
 # Update filename in config
@@ -1681,76 +2198,29 @@ st.markdown("""
 k1, k2, k3, k4 = st.columns(4)
 
 with k1:
-    rsi_val = float(df['rsi'].iat[-1])
+    rsi_val = float(rsi_arr[-1])
     rsi_color = "#ff4757" if rsi_val > 70 else "#00ff88" if rsi_val < 30 else "#ffa726"
     rsi_status = "OVERBOUGHT" if rsi_val > 70 else "OVERSOLD" if rsi_val < 30 else "NEUTRAL"
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2.5rem; font-weight: 700; color: {rsi_color}; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            {rsi_val:.1f}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">RSI (14)</div>
-        <div style="color: {rsi_color}; font-size: 0.9rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;">
-            {rsi_status}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(kpi_card_html(f"{rsi_val:.1f}", "RSI (14)", rsi_color, rsi_status), unsafe_allow_html=True)
 
 with k2:
-    wt1_val = float(df['wt1'].iat[-1])
-    wt1_color = "#00ff88" if wt1_val > df['wt2'].iat[-1] else "#ff4757"
-    wt1_trend = "BULLISH" if wt1_val > df['wt2'].iat[-1] else "BEARISH"
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2.5rem; font-weight: 700; color: {wt1_color}; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            {wt1_val:.2f}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">WaveTrend 1</div>
-        <div style="color: {wt1_color}; font-size: 0.9rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;">
-            {wt1_trend}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    wt1_val = float(wt1_arr[-1])
+    wt2_val = float(wt2_arr[-1])
+    wt1_color = "#00ff88" if wt1_val > wt2_val else "#ff4757"
+    wt1_trend = "BULLISH" if wt1_val > wt2_val else "BEARISH"
+    st.markdown(kpi_card_html(f"{wt1_val:.2f}", "WaveTrend 1", wt1_color, wt1_trend), unsafe_allow_html=True)
 
 with k3:
-    wt2_val = float(df['wt2'].iat[-1])
     wt2_color = "#00ff88" if wt2_val > 0 else "#ff4757"
     wt2_signal = "POSITIVE" if wt2_val > 0 else "NEGATIVE"
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2.5rem; font-weight: 700; color: {wt2_color}; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            {wt2_val:.2f}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">WaveTrend 2</div>
-        <div style="color: {wt2_color}; font-size: 0.9rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;">
-            {wt2_signal}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(kpi_card_html(f"{wt2_val:.2f}", "WaveTrend 2", wt2_color, wt2_signal), unsafe_allow_html=True)
 
 with k4:
     chg_color = "#00ff88" if price_change_24h_pct >= 0 else "#ff4757"
     chg_symbol = "↗" if price_change_24h_pct >= 0 else "↘"
     chg_trend = "RISING" if price_change_24h_pct >= 0 else "FALLING"
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2.5rem; font-weight: 700; color: {chg_color}; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            {chg_symbol} {abs(price_change_24h_pct):.2f}%
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">24h Change</div>
-        <div style="color: {chg_color}; font-size: 0.9rem; font-weight: 500; text-transform: uppercase; letter-spacing: 0.5px;">
-            {chg_trend}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(kpi_card_html(f"{chg_symbol} {abs(price_change_24h_pct):.2f}%", "24h Change", chg_color, chg_trend),
+                unsafe_allow_html=True)
 
 # Add additional technical indicators row
 st.markdown("<br>", unsafe_allow_html=True)
@@ -1758,64 +2228,28 @@ k5, k6, k7, k8 = st.columns(4)
 
 with k5:
     # Current Price
-    current_price = float(df['close'].iat[-1])
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2rem; font-weight: 700; color: #00ff88; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            ${current_price:.6f}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">Current Price</div>
-        <div style="color: #a0aec0; font-size: 0.9rem; font-weight: 500;">{symbol}</div>
-    </div>
-    """, unsafe_allow_html=True)
+    current_price = last_close
+    st.markdown(kpi_card_html(f"${current_price:.6f}", "Current Price", "#00ff88", symbol,
+                              status=False, value_size="2rem"), unsafe_allow_html=True)
 
 with k6:
     # High 24h
-    high_24h = float(df['high'].tail(24).max()) if len(df) >= 24 else float(df['high'].max())
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2rem; font-weight: 700; color: #00ff88; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            ${high_24h:.6f}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">24h High</div>
-        <div style="color: #a0aec0; font-size: 0.9rem; font-weight: 500;">MAXIMUM</div>
-    </div>
-    """, unsafe_allow_html=True)
+    high_24h = float(np.nanmax(high_arr[-24:]))
+    st.markdown(kpi_card_html(f"${high_24h:.6f}", "24h High", "#00ff88", "MAXIMUM",
+                              status=False, value_size="2rem"), unsafe_allow_html=True)
 
 with k7:
     # Low 24h
-    low_24h = float(df['low'].tail(24).min()) if len(df) >= 24 else float(df['low'].min())
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 2rem; font-weight: 700; color: #ff4757; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            ${low_24h:.6f}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">24h Low</div>
-        <div style="color: #a0aec0; font-size: 0.9rem; font-weight: 500;">MINIMUM</div>
-    </div>
-    """, unsafe_allow_html=True)
+    low_24h = float(np.nanmin(low_arr[-24:]))
+    st.markdown(kpi_card_html(f"${low_24h:.6f}", "24h Low", "#ff4757", "MINIMUM",
+                              status=False, value_size="2rem"), unsafe_allow_html=True)
 
 with k8:
     # Volume 24h
-    volume_24h = float(df['volume'].tail(24).sum()) if len(df) >= 24 and 'volume' in df.columns else 0
+    volume_24h = float(np.nansum(vol_arr[-24:])) if vol_arr is not None and len(vol_arr) >= 24 else 0
     volume_display = f"{volume_24h:,.0f}" if volume_24h > 0 else "N/A"
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%); 
-                padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.2); 
-                text-align: center; transition: all 0.3s ease; box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);">
-        <div style="font-size: 1.8rem; font-weight: 700; color: #ffa726; margin-bottom: 0.5rem; text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);">
-            {volume_display}
-        </div>
-        <div style="color: #fff; font-size: 1.1rem; font-weight: 600; margin-bottom: 0.25rem;">24h Volume</div>
-        <div style="color: #a0aec0; font-size: 0.9rem; font-weight: 500;">TRADING</div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(kpi_card_html(volume_display, "24h Volume", "#ffa726", "TRADING",
+                              status=False, value_size="1.8rem"), unsafe_allow_html=True)
 
 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1828,12 +2262,8 @@ st.markdown("""
     </h3>
 """, unsafe_allow_html=True)
 
-# Style the dataframe
-styled_df = df.tail(20).copy()
-styled_df['timestamp'] = pd.to_datetime(styled_df['timestamp']).dt.strftime('%H:%M:%S')
-styled_df = styled_df.round(6)
-
-st.markdown(styled_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+# Style the dataframe (last 20 bars, HH:MM:SS times, 6 decimals)
+st.markdown(frame_to_html(df.tail(20), time_format='%H:%M:%S', decimals=6), unsafe_allow_html=True)
 
 st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1854,41 +2284,11 @@ with cpos:
         pnl_color = "#48bb78" if pnl >= 0 else "#f56565"
         bars_in_trade = len(df) - p['entry_idx'] if 'entry_idx' in p else 0
         
-        st.markdown(f"""
-        <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
-                    border: 1px solid var(--border-color);">
-            <h4 style="margin: 0 0 1rem 0; color: var(--text-primary); display: flex; align-items: center; gap: 0.5rem;">
-                📈 Open Position
-            </h4>
-            <div style="display: grid; gap: 0.75rem;">
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Entry Price:</span>
-                    <span style="color: var(--text-primary); font-weight: 600;">${p['entry_price']:.6f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Quantity:</span>
-                    <span style="color: var(--text-primary); font-weight: 600;">{p['qty']:.6f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Unrealized P&L:</span>
-                    <span style="color: {pnl_color}; font-weight: 700;">${pnl:,.2f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Bars in Trade:</span>
-                    <span style="color: var(--text-primary); font-weight: 600;">{bars_in_trade}</span>
-                </div>
-                <hr style="border-color: var(--border-color); margin: 0.5rem 0;">
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Stop Loss:</span>
-                    <span style="color: var(--accent-red); font-weight: 600;">${(p['entry_price']*(1-float(stop_loss_pct))):.6f}</span>
-                </div>
-                <div style="display: flex; justify-content: space-between;">
-                    <span style="color: var(--text-secondary);">Take Profit:</span>
-                    <span style="color: var(--accent-green); font-weight: 600;">${(p['entry_price']*(1+float(take_profit_pct))):.6f}</span>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(open_position_html(
+            p['entry_price'], p['qty'], pnl, pnl_color, bars_in_trade,
+            stop_loss=p['stop_price'] if 'stop_price' in p else p['entry_price'] * (1 - float(stop_loss_pct)),
+            take_profit=p['tp_price'] if 'tp_price' in p else p['entry_price'] * (1 + float(take_profit_pct)),
+        ), unsafe_allow_html=True)
     else:
         st.markdown("""
         <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
@@ -1913,10 +2313,10 @@ with cords:
         </div>
         """, unsafe_allow_html=True)
         
-        trades_df = pd.DataFrame(st.session_state['trades'])
+        # Slice before building the frame: construction cost then stays at 10 rows
+        trades_df = pd.DataFrame(st.session_state['trades'][-10:])  # Show only last 10 trades
         if not trades_df.empty:
-            trades_df = trades_df.tail(10)  # Show only last 10 trades
-            st.markdown(trades_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+            st.markdown(frame_to_html(trades_df), unsafe_allow_html=True)
     else:
         st.markdown("""
         <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
@@ -1942,122 +2342,52 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 spr1, spr2, spr3 = st.columns(3)
+# One tail slice per column, shared by the three sparklines
+tail_ts = df['timestamp'].to_numpy()[-100:]
 with spr1:
-    rsi_fig = go.Figure()
-    rsi_fig.add_trace(go.Scatter(
-        x=df['timestamp'].tail(100), 
-        y=df['rsi'].tail(100), 
-        mode='lines', 
-        line=dict(color="#4299e1", width=2),
-        name="RSI"
-    ))
-    rsi_fig.update_layout(
-        height=150, 
-        margin=dict(l=10, r=10, t=20, b=10), 
-        xaxis_visible=False, 
-        yaxis_title="RSI",
-        template='plotly_dark' if dark_theme else 'plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=False
-    )
-    rsi_fig.update_yaxes(range=[0, 100])
-    st.plotly_chart(rsi_fig, use_container_width=True, config={'displaylogo': False, 'modeBarButtonsToRemove': ['select2d','lasso2d']})
+    rsi_fig = sparkline_figure(tail_ts, rsi_arr[-100:], "RSI", "#4299e1", dark_theme, y_range=(0, 100))
+    st.plotly_chart(rsi_fig, use_container_width=True, config=SPARKLINE_CONFIG)
 
 with spr2:
-    wt1_fig = go.Figure()
-    wt1_fig.add_trace(go.Scatter(
-        x=df['timestamp'].tail(100), 
-        y=df['wt1'].tail(100), 
-        mode='lines', 
-        line=dict(color="#48bb78", width=2),
-        name="WT1"
-    ))
-    wt1_fig.update_layout(
-        height=150, 
-        margin=dict(l=10, r=10, t=20, b=10), 
-        xaxis_visible=False, 
-        yaxis_title="WT1",
-        template='plotly_dark' if dark_theme else 'plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=False
-    )
-    st.plotly_chart(wt1_fig, use_container_width=True, config={'displaylogo': False, 'modeBarButtonsToRemove': ['select2d','lasso2d']})
+    wt1_fig = sparkline_figure(tail_ts, wt1_arr[-100:], "WT1", "#48bb78", dark_theme)
+    st.plotly_chart(wt1_fig, use_container_width=True, config=SPARKLINE_CONFIG)
 
 with spr3:
-    wt2_fig = go.Figure()
-    wt2_fig.add_trace(go.Scatter(
-        x=df['timestamp'].tail(100), 
-        y=df['wt2'].tail(100), 
-        mode='lines', 
-        line=dict(color="#a0aec0", width=2),
-        name="WT2"
-    ))
-    wt2_fig.update_layout(
-        height=150, 
-        margin=dict(l=10, r=10, t=20, b=10), 
-        xaxis_visible=False, 
-        yaxis_title="WT2",
-        template='plotly_dark' if dark_theme else 'plotly_white',
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        showlegend=False
-    )
-    st.plotly_chart(wt2_fig, use_container_width=True, config={'displaylogo': False, 'modeBarButtonsToRemove': ['select2d','lasso2d']})
+    wt2_fig = sparkline_figure(tail_ts, wt2_arr[-100:], "WT2", "#a0aec0", dark_theme)
+    st.plotly_chart(wt2_fig, use_container_width=True, config=SPARKLINE_CONFIG)
 
 st.markdown("</div>", unsafe_allow_html=True)
 
 latest_idx = len(df) - 1
-latest_price = float(df['close'].iat[latest_idx]) if not pd.isna(df['close'].iat[latest_idx]) else 0.0
-signal_now = bool(df['signal'].iat[latest_idx])
+# Last-bar snapshot, read once from the column arrays and reused by the trade,
+# sidebar and signals-tab blocks below
+latest_price = float(close_arr[latest_idx]) if not pd.isna(close_arr[latest_idx]) else 0.0
+latest_rsi = float(rsi_arr[latest_idx])
+latest_wt1 = float(wt1_arr[latest_idx])
+latest_wt2 = float(wt2_arr[latest_idx])
+signal_now = bool(df['signal'].to_numpy()[latest_idx])
+# Trigger columns (missing ones count as False) and the name of the one that fired;
+# the column membership checks are done once here rather than in every block below
+has_trigger_signals = 'final_buy' in df.columns and 'final_sell' in df.columns
+trigger_cols = [c for c in TRIGGER_SIGNAL_COLUMNS if c in df.columns]
+last_trigger = dict.fromkeys(TRIGGER_SIGNAL_COLUMNS, False)
+last_trigger.update((c, bool(df[c].to_numpy()[latest_idx])) for c in trigger_cols)
+latest_trigger_name = df['trigger_name'].array[latest_idx] if 'trigger_name' in df.columns else None
+if pd.isna(latest_trigger_name):
+    latest_trigger_name = None
 wt_cross_down_now = False
 if latest_idx > 0:  # Prevent index out of bounds
-    wt_cross_down_now = (df['wt1'].iat[latest_idx-1] >= df['wt2'].iat[latest_idx-1]) and (df['wt1'].iat[latest_idx] < df['wt2'].iat[latest_idx])
+    (w1_prev, w1_last), (w2_prev, w2_last) = wt1_arr[-2:], wt2_arr[-2:]
+    wt_cross_down_now = bool(w1_prev >= w2_prev and w1_last < w2_last)
 
 # Show latest signal badge with new trigger system
 sig_badge = "No signal"
 sig_color = "#8899aa"
 signal_description = ""
 
-if 'final_buy' in df.columns and 'final_sell' in df.columns:
-    buy_signal_now = bool(df['final_buy'].iat[latest_idx])
-    sell_signal_now = bool(df['final_sell'].iat[latest_idx])
-    
-    if buy_signal_now:
-        # Determine which trigger fired
-        if 'wt_buy' in df.columns and bool(df['wt_buy'].iat[latest_idx]):
-            sig_badge = "WT Green Dot"
-            signal_description = "Highest Priority"
-            sig_color = "#00ff88"
-        elif 'momentum_buy' in df.columns and bool(df['momentum_buy'].iat[latest_idx]):
-            sig_badge = "Momentum BUY"
-            signal_description = "Medium Priority"
-            sig_color = "#22cc88"
-        elif 'rsi_buy' in df.columns and bool(df['rsi_buy'].iat[latest_idx]):
-            sig_badge = "RSI BUY"
-            signal_description = "Low Priority"
-            sig_color = "#88cc22"
-        else:
-            sig_badge = "BUY Signal"
-            sig_color = "#22cc88"
-    elif sell_signal_now:
-        # Determine which trigger fired
-        if 'wt_sell' in df.columns and bool(df['wt_sell'].iat[latest_idx]):
-            sig_badge = "WT Red Dot"
-            signal_description = "Highest Priority"
-            sig_color = "#ff4444"
-        elif 'momentum_sell' in df.columns and bool(df['momentum_sell'].iat[latest_idx]):
-            sig_badge = "Momentum SELL"
-            signal_description = "Medium Priority"
-            sig_color = "#cc2222"
-        elif 'rsi_sell' in df.columns and bool(df['rsi_sell'].iat[latest_idx]):
-            sig_badge = "RSI SELL"
-            signal_description = "Low Priority"
-            sig_color = "#cc8822"
-        else:
-            sig_badge = "SELL Signal"
-            sig_color = "#cc2222"
+if has_trigger_signals:
+    if latest_trigger_name is not None:
+        sig_badge, signal_description, sig_color = TRIGGER_BADGES[latest_trigger_name]
 elif signal_now:
     # Fallback for other strategies
     sig_badge = "BUY signal"
@@ -2065,6 +2395,9 @@ elif signal_now:
 
 # Trading execution logic (runs for all strategies when is_trading is True)
     if st.session_state['is_trading']:
+        # One clock read per tick, shared by every trade logged in it
+        now_ms = int(time.time()*1000)
+        position_closed = False
         try:
             # Mode-specific trading logic
             paper_mode = st.session_state.get('paper_mode', True)
@@ -2078,17 +2411,12 @@ elif signal_now:
                 pos = st.session_state['position']
                 entry_price = pos['entry_price']
                 qty = pos['qty']
-                stop_price = entry_price * (1 - float(stop_loss_pct))
-                tp_price = entry_price * (1 + float(take_profit_pct))
                 bars_in_trade = latest_idx - pos['entry_idx']
-                should_exit = False
-                if latest_price <= stop_price or latest_price >= tp_price:
-                    should_exit = True
-                if not should_exit and wt_cross_down_now:
-                    should_exit = True
-                if not should_exit and bars_in_trade >= int(max_bars_in_trade):
-                    should_exit = True
-                if should_exit:
+                # Levels were fixed at entry (positions opened by older sessions lack them)
+                levels = pos if 'stop_price' in pos else exit_levels(
+                    entry_price, stop_loss_pct, take_profit_pct, max_bars_in_trade)
+                if should_exit_position(latest_price, levels['stop_price'], levels['tp_price'],
+                                        bars_in_trade, levels['max_bars'], wt_cross_down_now):
                     side = 'sell' if qty > 0 else 'buy'
                     order = _exec.place_market_order(symbol, side, abs(qty))
                     pnl = (latest_price - entry_price) * qty
@@ -2099,18 +2427,16 @@ elif signal_now:
                             'exit_price': latest_price,
                             'pnl': pnl
                         })
-                    try:
-                        log_trade('logs/trades.csv', {
-                            'symbol': symbol,
-                            'side': side,
-                            'qty': abs(qty),
-                            'price': latest_price,
-                            'pnl': pnl,
-                            'ts': int(time.time()*1000)
-                        })
-                    except Exception:
-                        pass
+                    log_trade('logs/trades.csv', {
+                        'symbol': symbol,
+                        'side': side,
+                        'qty': abs(qty),
+                        'price': latest_price,
+                        'pnl': pnl,
+                        'ts': now_ms
+                    })
                     st.session_state['position'] = None
+                    position_closed = True
 
             # Entry logic using new 3-tier trading trigger system
             if st.session_state['position'] is None and not pd.isna(latest_price) and latest_price > 0:
@@ -2119,132 +2445,36 @@ elif signal_now:
                 sell_signal = False
                 signal_type = "None"
                 
-                if strat_choice == 'auto' and 'final_buy' in df.columns and 'final_sell' in df.columns:
-                    buy_signal = bool(df['final_buy'].iat[latest_idx])
-                    sell_signal = bool(df['final_sell'].iat[latest_idx])
+                if strat_choice == 'auto' and has_trigger_signals:
+                    buy_signal = last_trigger['final_buy']
+                    sell_signal = last_trigger['final_sell']
                     
-                    # Determine signal type for logging
-                    if 'wt_buy' in df.columns and bool(df['wt_buy'].iat[latest_idx]):
-                        signal_type = "WT Green Dot"
-                    elif 'wt_sell' in df.columns and bool(df['wt_sell'].iat[latest_idx]):
-                        signal_type = "WT Red Dot"
-                    elif 'momentum_buy' in df.columns and bool(df['momentum_buy'].iat[latest_idx]):
-                        signal_type = "Momentum Buy"
-                    elif 'momentum_sell' in df.columns and bool(df['momentum_sell'].iat[latest_idx]):
-                        signal_type = "Momentum Sell"
-                    elif 'rsi_buy' in df.columns and bool(df['rsi_buy'].iat[latest_idx]):
-                        signal_type = "RSI Buy"
-                    elif 'rsi_sell' in df.columns and bool(df['rsi_sell'].iat[latest_idx]):
-                        signal_type = "RSI Sell"
+                    # Signal type for logging
+                    signal_type = latest_trigger_name or "None"
                 else:
                     # Fallback to old signal system for other strategies
                     buy_signal = signal_now
                     signal_type = f"{strat_choice} strategy"
                 
-                # Execute buy trade
+                # Long on a buy signal, short on a sell signal; anything else falls back
+                # to a plain long entry recorded without the trigger details
+                signal_entry = {
+                    'signal_type': signal_type,
+                    'entry_rsi': latest_rsi,
+                    'entry_wt1': latest_wt1,
+                    'entry_wt2': latest_wt2,
+                }
                 if buy_signal and position_mode in ['Long only', 'Long + Short']:
-                        risk_usd = st.session_state['account']['cash'] * float(risk_per_trade)
-                        qty = position_size_from_risk(st.session_state['account']['cash'], float(risk_per_trade), latest_price)
-                        if qty > 0:
-                            order = _exec.place_market_order(symbol, 'buy', qty)
-                            st.session_state['position'] = {
-                                'entry_price': latest_price, 
-                                'qty': qty, 
-                                'entry_idx': latest_idx,
-                                'strategy': strat_choice,
-                            'signal_type': signal_type,
-                            'entry_rsi': float(df['rsi'].iat[latest_idx]),
-                            'entry_wt1': float(df['wt1'].iat[latest_idx]),
-                            'entry_wt2': float(df['wt2'].iat[latest_idx])
-                            }
-                            st.session_state['trades'].append({
-                                'entry_idx': latest_idx, 
-                                'entry_price': latest_price, 
-                                'qty': qty,
-                                'strategy': strat_choice,
-                            'signal_type': signal_type,
-                            'entry_rsi': float(df['rsi'].iat[latest_idx])
-                            })
-                            try:
-                                log_trade('logs/trades.csv', {
-                                    'symbol': symbol,
-                                    'side': 'buy',
-                                    'qty': qty,
-                                    'price': latest_price,
-                                    'strategy': strat_choice,
-                                    'signal_type': signal_type,
-                                    'rsi': float(df['rsi'].iat[latest_idx]),
-                                    'ts': int(time.time()*1000)
-                                })
-                            except Exception:
-                                pass
-                
-                # Execute sell trade (for short positions)
+                    entry_side = 'buy'
                 elif sell_signal and position_mode == 'Long + Short':
-                    risk_usd = st.session_state['account']['cash'] * float(risk_per_trade)
-                    qty = position_size_from_risk(st.session_state['account']['cash'], float(risk_per_trade), latest_price)
-                    if qty > 0:
-                        order = _exec.place_market_order(symbol, 'sell', qty)
-                        st.session_state['position'] = {
-                            'entry_price': latest_price, 
-                            'qty': -qty,  # Negative quantity for short position
-                            'entry_idx': latest_idx,
-                            'strategy': strat_choice,
-                            'signal_type': signal_type,
-                            'entry_rsi': float(df['rsi'].iat[latest_idx]),
-                            'entry_wt1': float(df['wt1'].iat[latest_idx]),
-                            'entry_wt2': float(df['wt2'].iat[latest_idx])
-                        }
-                        st.session_state['trades'].append({
-                            'entry_idx': latest_idx, 
-                            'entry_price': latest_price, 
-                            'qty': -qty,
-                            'strategy': strat_choice,
-                            'signal_type': signal_type,
-                            'entry_rsi': float(df['rsi'].iat[latest_idx])
-                        })
-                        try:
-                            log_trade('logs/trades.csv', {
-                                'symbol': symbol,
-                                'side': 'sell',
-                                'qty': qty,
-                                'price': latest_price,
-                                'strategy': strat_choice,
-                                'signal_type': signal_type,
-                                'rsi': float(df['rsi'].iat[latest_idx]),
-                                'ts': int(time.time()*1000)
-                            })
-                        except Exception:
-                            pass
+                    entry_side = 'sell'
                 else:
-                    # For other strategies, use the signal as is
-                    risk_usd = st.session_state['account']['cash'] * float(risk_per_trade)
-                    qty = position_size_from_risk(st.session_state['account']['cash'], float(risk_per_trade), latest_price)
-                    if qty > 0:
-                        order = _exec.place_market_order(symbol, 'buy', qty)
-                        st.session_state['position'] = {
-                            'entry_price': latest_price, 
-                            'qty': qty, 
-                            'entry_idx': latest_idx,
-                            'strategy': strat_choice
-                        }
-                        st.session_state['trades'].append({
-                            'entry_idx': latest_idx, 
-                            'entry_price': latest_price, 
-                            'qty': qty,
-                            'strategy': strat_choice
-                        })
-                        try:
-                            log_trade('logs/trades.csv', {
-                                'symbol': symbol,
-                                'side': 'buy',
-                                'qty': qty,
-                                'price': latest_price,
-                                'strategy': strat_choice,
-                                'ts': int(time.time()*1000)
-                            })
-                        except Exception:
-                            pass
+                    entry_side, signal_entry = 'buy', None
+                open_position(
+                    _exec, symbol, entry_side, latest_price, latest_idx, risk_per_trade,
+                    exit_levels(latest_price, stop_loss_pct, take_profit_pct, max_bars_in_trade),
+                    strat_choice, now_ms, signal_entry,
+                )
 
             # Equity tracking
             if st.session_state['position'] is not None:
@@ -2253,11 +2483,9 @@ elif signal_now:
                 equity_val = st.session_state['account']['cash'] + unreal
             else:
                 equity_val = st.session_state['account']['cash']
-            st.session_state['account']['equity'].append(float(equity_val))
-            try:
-                log_pnl('logs/equity.csv', float(equity_val))
-            except Exception:
-                pass
+            record_equity(st.session_state['account'], float(equity_val))
+            # A closed position writes the queued equity rows out with this one
+            log_pnl('logs/equity.csv', float(equity_val), flush=position_closed)
 
         except Exception as e:
             st.error(f"Trading Logic Error: {e}")
@@ -2277,80 +2505,14 @@ tabs = st.tabs(["🎯 Strategy", "💼 Account", "📋 Orders", "📈 Market", "
 with tabs[0]:
     # Get current strategy name
     current_strategy = strat_choice if 'strat_choice' in locals() else 'auto'
-    strategy_name = {
-        'auto': 'TradingView Webhook + RSI + WaveTrend (Auto)',
-        'ema_crossover': 'EMA Crossover',
-        'rsi_bbands': 'RSI + Bollinger Bands',
-        'grid': 'Grid Trading'
-    }.get(current_strategy, 'TradingView Webhook + RSI + WaveTrend (Auto)')
-    
-    # Calculate values first to avoid f-string format errors
-    sl_display = f"{(stop_loss_pct * 100):.1f}%"
-    tp_display = f"{(take_profit_pct * 100):.1f}%"
-    max_bars_display = max_bars_in_trade
-    rsi_threshold = rsi_oversold
-    refresh_display = refresh_secs
     is_trading = 'is_trading' in st.session_state and st.session_state['is_trading']
-    last_signal = 'BUY' if 'df' in locals() and len(df) > 0 and 'signal' in df.columns and bool(df['signal'].iat[-1]) else 'No Signal'
-    
-    st.markdown(f"""
-    <div class="strategy-card">
-        <div class="strategy-header">
-            🎯 Active Strategy: {strategy_name}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    last_signal = 'BUY' if signal_now else 'No Signal'
     
-    # Entry Conditions
-    with st.container():
-        st.markdown("""
-        <div class="conditions-list">
-            <h4>Entry Conditions</h4>
-            <ul>
-        """, unsafe_allow_html=True)
-        
-        if current_strategy == 'auto':
-            st.markdown('<li>Priority 1: WaveTrend cross up (WT1 > WT2)</li>', unsafe_allow_html=True)
-            st.markdown('<li>Priority 2: TradingView Webhook buy signal</li>', unsafe_allow_html=True)
-            st.markdown('<li>Priority 3: RSI > 53 (Buy) or RSI < 47 (Sell)</li>', unsafe_allow_html=True)
-        if current_strategy == 'rsi_bbands':
-            st.markdown(f'<li>RSI below oversold threshold ({rsi_threshold})</li>', unsafe_allow_html=True)
-        if current_strategy == 'ema_crossover':
-            st.markdown('<li>EMA Fast crosses above EMA Slow</li>', unsafe_allow_html=True)
-        if current_strategy == 'rsi_bbands':
-            st.markdown('<li>Price below Bollinger Lower Band</li>', unsafe_allow_html=True)
-        if current_strategy == 'grid':
-            st.markdown('<li>Price crosses below grid level</li>', unsafe_allow_html=True)
-        
-        st.markdown("</ul></div>", unsafe_allow_html=True)
-    
-    # Exit Conditions
-    with st.container():
-        st.markdown(f"""
-        <div class="conditions-list">
-            <h4>Exit Conditions</h4>
-            <ul>
-                <li>Stop Loss: {sl_display}</li>
-                <li>Take Profit: {tp_display}</li>
-        """, unsafe_allow_html=True)
-        
-        if current_strategy == 'auto':
-            st.markdown('<li>WaveTrend cross down</li>', unsafe_allow_html=True)
-        
-        st.markdown(f'<li>Max bars in trade: {max_bars_display}</li></ul></div>', unsafe_allow_html=True)
-    
-    # Strategy Status
-    status_color = "var(--accent-green)" if is_trading else "var(--accent-red)"
-    status_emoji = "🟢 LIVE TRADING" if is_trading else "🔴 STOPPED"
-    
-    st.markdown(f"""
-    <div class="status-box">
-        <div class="status-text" style="color: {status_color};">{status_emoji}</div>
-        <div class="status-details">
-            Last signal: {last_signal} • Next refresh: {refresh_display}s
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # Strategy card, entry/exit conditions and status in one element
+    st.markdown(strategy_tab_html(
+        current_strategy, f"{(stop_loss_pct * 100):.1f}%", f"{(take_profit_pct * 100):.1f}%",
+        max_bars_in_trade, rsi_oversold, bool(is_trading), last_signal, refresh_secs,
+    ), unsafe_allow_html=True)
 
 with tabs[1]:
     # Account tab - Balance removed, now only shows in sidebar
@@ -2382,33 +2544,26 @@ with tabs[2]:
             """, unsafe_allow_html=True)
             
             # Display real trades
-            for trade in real_trades[:10]:  # Show last 10 real trades
-                symbol = trade.get('symbol', 'Unknown')
-                side = trade.get('side', 'Unknown')
-                qty = trade.get('qty', 0)
-                price = trade.get('price', 0)
-                timestamp = trade.get('timestamp', 0)
-                
-                # Format timestamp
-                try:
-                    if timestamp:
-                        trade_time = pd.to_datetime(timestamp, unit='ms').strftime('%H:%M:%S')
-                    else:
-                        trade_time = 'Unknown'
-                except:
-                    trade_time = 'Unknown'
-                
-                st.markdown(f"""
-                <div style="background: var(--card-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0; border-left: 4px solid var(--accent-blue);">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <span style="color: var(--text-primary); font-weight: 600;">{symbol}</span>
-                        <span style="color: var(--text-secondary); font-size: 0.9rem;">{trade_time}</span>
-                    </div>
-                    <div style="color: var(--text-secondary); font-size: 0.9rem;">
-                        {side} • Qty: {qty} • Price: ${float(price):,.4f}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            shown_trades = real_trades[:10]  # Show last 10 real trades
+            # Format all timestamps in one pass; missing, unparsable or out-of-range
+            # values show as 'Unknown'
+            ts_ms = pd.to_numeric(
+                pd.Series([t.get('timestamp') or np.nan for t in shown_trades], dtype=object), errors='coerce'
+            )
+            trade_times = (
+                pd.to_datetime(ts_ms.where(ts_ms.abs() < 9.2e12), unit='ms')
+                .dt.strftime('%H:%M:%S').fillna('Unknown').tolist()
+            )
+            cards = []
+            for trade, trade_time in zip(shown_trades, trade_times):
+                cards.append(_REAL_TRADE_CARD.substitute(
+                    symbol=trade.get('symbol', 'Unknown'),
+                    trade_time=trade_time,
+                    side=trade.get('side', 'Unknown'),
+                    qty=trade.get('qty', 0),
+                    price=f"{float(trade.get('price', 0)):,.4f}",
+                ))
+            st.markdown("".join(cards), unsafe_allow_html=True)
         else:
             st.markdown("""
             <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
@@ -2433,10 +2588,9 @@ with tabs[2]:
             </div>
             """, unsafe_allow_html=True)
             
-            trades_df = pd.DataFrame(st.session_state['trades'])
+            trades_df = pd.DataFrame(st.session_state['trades'][-20:])  # Show last 20 trades
             if not trades_df.empty:
-                trades_df = trades_df.tail(20)  # Show last 20 trades
-                st.markdown(trades_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+                st.markdown(frame_to_html(trades_df), unsafe_allow_html=True)
         else:
             st.markdown("""
             <div style="background: var(--secondary-bg); padding: 1.5rem; border-radius: var(--border-radius); 
@@ -2452,7 +2606,7 @@ with tabs[2]:
 
 with tabs[3]:
     try:
-        tk = _exec.fetch_ticker(symbol)
+        tk = fetch_ticker(_exec, ex_name, paper, symbol, int(time.time() // refresh_secs))
         last = tk.get('last') or tk.get('close') or 0.0
         high24 = tk.get('high') or 0.0
         low24 = tk.get('low') or 0.0
@@ -2476,76 +2630,41 @@ with tabs[3]:
         </div>
         """, unsafe_allow_html=True)
         
-        colm1, colm2 = st.columns(2)
-        with colm1:
-            st.metric("Last Price", f"${float(last):,.4f}")
-            st.metric("24h Change", f"{price_change_24h_pct:+.2f}%", f"{price_change_24h:+.4f}")
-            st.metric("24h High", f"${float(high24):,.4f}")
-            st.metric("24h Low", f"${float(low24):,.4f}")
-        with colm2:
-            st.metric("Base Vol (24h)", f"{float(base_volume):,.0f}")
-            st.metric("Quote Vol (24h)", f"{float(quote_volume):,.0f}")
-            st.metric("Market Cap", fmt_m(market_cap) if market_cap else "N/A")
+        # Read-only values, so one HTML grid instead of a column of st.metric widgets;
+        # cells run down the left column first, as the metrics did
+        change_up = price_change_24h >= 0
+        change_delta = _MARKET_STAT_DELTA.substitute(
+            color="var(--accent-green)" if change_up else "var(--accent-red)",
+            arrow="▲" if change_up else "▼", text=f"{price_change_24h:+.4f}",
+        )
+        stats = [
+            ("Last Price", f"${float(last):,.4f}", ""),
+            ("Base Vol (24h)", f"{float(base_volume):,.0f}", ""),
+            ("24h Change", f"{price_change_24h_pct:+.2f}%", change_delta),
+            ("Quote Vol (24h)", f"{float(quote_volume):,.0f}", ""),
+            ("24h High", f"${float(high24):,.4f}", ""),
+            ("Market Cap", fmt_m(market_cap) if market_cap else "N/A", ""),
+            ("24h Low", f"${float(low24):,.4f}", ""),
+        ]
+        stat_cells = "".join(
+            _MARKET_STAT_CELL.substitute(label=label, value=value, delta=delta) for label, value, delta in stats
+        )
+        st.markdown(_SIGNAL_TAB_GRID.substitute(title="", columns=2, cells=stat_cells), unsafe_allow_html=True)
     except Exception as e:
         st.error(f"Unable to fetch market data: {e}")
 
 with tabs[4]:
     # Use the new signal system if available
-    if 'final_buy' in df.columns and 'final_sell' in df.columns:
-        buy_signal_now = bool(df['final_buy'].iat[-1]) if len(df) > 0 else False
-        sell_signal_now = bool(df['final_sell'].iat[-1]) if len(df) > 0 else False
-        
-        if buy_signal_now:
-            # Determine which trigger fired
-            if 'wt_buy' in df.columns and bool(df['wt_buy'].iat[-1]):
-                sig_badge = "WT Green Dot"
-                signal_description = "Highest Priority"
-                sig_color = "#00ff88"
-            elif 'momentum_buy' in df.columns and bool(df['momentum_buy'].iat[-1]):
-                sig_badge = "Momentum BUY"
-                signal_description = "Medium Priority"
-                sig_color = "#22cc88"
-            elif 'rsi_buy' in df.columns and bool(df['rsi_buy'].iat[-1]):
-                sig_badge = "RSI BUY"
-                signal_description = "Low Priority"
-                sig_color = "#88cc22"
-            else:
-                sig_badge = "BUY Signal"
-                sig_color = "#22cc88"
-                signal_description = ""
-        elif sell_signal_now:
-            # Determine which trigger fired
-            if 'wt_sell' in df.columns and bool(df['wt_sell'].iat[-1]):
-                sig_badge = "WT Red Dot"
-                signal_description = "Highest Priority"
-                sig_color = "#ff4444"
-            elif 'momentum_sell' in df.columns and bool(df['momentum_sell'].iat[-1]):
-                sig_badge = "Momentum SELL"
-                signal_description = "Medium Priority"
-                sig_color = "#cc2222"
-            elif 'rsi_sell' in df.columns and bool(df['rsi_sell'].iat[-1]):
-                sig_badge = "RSI SELL"
-                signal_description = "Low Priority"
-                sig_color = "#cc8822"
-            else:
-                sig_badge = "SELL Signal"
-                sig_color = "#cc2222"
-                signal_description = ""
-        else:
-            sig_badge = "No Signal"
-            sig_color = "#a0aec0"
-            signal_description = ""
+    if has_trigger_signals:
+        sig_badge, signal_description, sig_color = TRIGGER_BADGES.get(latest_trigger_name, NO_SIGNAL_BADGE)
     else:
         # Fallback to old system
-        signal_now = bool(df['signal'].iat[-1]) if len(df) > 0 else False
         sig_badge = "BUY Signal Active" if signal_now else "No Signal"
         sig_color = "#48bb78" if signal_now else "#a0aec0"
         signal_description = ""
     
     # Get current RSI and WT values for display
-    current_rsi = float(df['rsi'].iat[-1]) if len(df) > 0 and 'rsi' in df.columns else 0.0
-    current_wt1 = float(df['wt1'].iat[-1]) if len(df) > 0 and 'wt1' in df.columns else 0.0
-    current_wt2 = float(df['wt2'].iat[-1]) if len(df) > 0 and 'wt2' in df.columns else 0.0
+    current_rsi, current_wt1, current_wt2 = latest_rsi, latest_wt1, latest_wt2
     
     # Determine signal strength indicator
     signal_strength = "🟢" if sig_badge.startswith("WT") else "🟡" if "Momentum" in sig_badge else "🔴" if "RSI" in sig_badge else "⚪"
@@ -2560,160 +2679,43 @@ with tabs[4]:
     with col2:
         st.markdown(f"**Priority:** {signal_strength}")
     
-    # Main signal info in columns
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("**📈 Current Signal**")
-        signal_html = f"<p style='color: #888; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>{signal_description}</p>" if signal_description else ""
-        st.markdown(f"<div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; border-left: 4px solid {sig_color};'>"
-                   f"<h3 style='color: {sig_color}; margin: 0;'>{sig_badge}</h3>"
-                   f"{signal_html}"
-                   f"</div>", unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("**⏰ Last Updated**")
-        st.markdown(f"<div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; border-left: 4px solid #4CAF50;'>"
-                   f"<h3 style='color: #fff; margin: 0;'>{pd.Timestamp.now().strftime('%H:%M:%S')}</h3>"
-                   f"<p style='color: #888; margin: 0.5rem 0 0 0; font-size: 0.9rem;'>{pd.Timestamp.now().strftime('%Y-%m-%d')}</p>"
-                   f"</div>", unsafe_allow_html=True)
-    
+    # Main signal info: current signal and last update side by side
+    updated_at = datetime.now()
+    status_cells = "".join([
+        _SIGNAL_TAB_STATUS_CELL.substitute(
+            title="📈 Current Signal", border_color=sig_color, color=sig_color, headline=sig_badge,
+            caption=_SIGNAL_TAB_CAPTION.substitute(text=signal_description) if signal_description else "",
+        ),
+        _SIGNAL_TAB_STATUS_CELL.substitute(
+            title="⏰ Last Updated", border_color="#4CAF50", color="#fff", headline=updated_at.strftime('%H:%M:%S'),
+            caption=_SIGNAL_TAB_CAPTION.substitute(text=updated_at.strftime('%Y-%m-%d')),
+        ),
+    ])
+    st.markdown(_SIGNAL_TAB_GRID.substitute(title="", columns=2, cells=status_cells), unsafe_allow_html=True)
+
     # Technical indicators
-    st.markdown("**📊 Technical Indicators**")
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        rsi_color = '#4CAF50' if current_rsi > 50 else '#f44336'
-        st.markdown(f"<div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; text-align: center;'>"
-                   f"<p style='color: #888; margin: 0; font-size: 0.8rem;'>RSI</p>"
-                   f"<h2 style='color: {rsi_color}; margin: 0;'>{current_rsi:.1f}</h2>"
-                   f"</div>", unsafe_allow_html=True)
-    
-    with col2:
-        wt1_color = '#4CAF50' if current_wt1 > current_wt2 else '#f44336'
-        st.markdown(f"<div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; text-align: center;'>"
-                   f"<p style='color: #888; margin: 0; font-size: 0.8rem;'>WT1</p>"
-                   f"<h2 style='color: {wt1_color}; margin: 0;'>{current_wt1:.1f}</h2>"
-                   f"</div>", unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"<div style='padding: 1rem; background-color: #1e1e1e; border-radius: 8px; text-align: center;'>"
-                   f"<p style='color: #888; margin: 0; font-size: 0.8rem;'>WT2</p>"
-                   f"<h2 style='color: #fff; margin: 0;'>{current_wt2:.1f}</h2>"
-                   f"</div>", unsafe_allow_html=True)
+    rsi_color = '#4CAF50' if current_rsi > 50 else '#f44336'
+    wt1_color = '#4CAF50' if current_wt1 > current_wt2 else '#f44336'
+    indicator_cells = "".join([
+        _SIGNAL_TAB_INDICATOR_CELL.substitute(label="RSI", color=rsi_color, value=f"{current_rsi:.1f}"),
+        _SIGNAL_TAB_INDICATOR_CELL.substitute(label="WT1", color=wt1_color, value=f"{current_wt1:.1f}"),
+        _SIGNAL_TAB_INDICATOR_CELL.substitute(label="WT2", color="#fff", value=f"{current_wt2:.1f}"),
+    ])
+    st.markdown(_SIGNAL_TAB_GRID.substitute(
+        title="<p style='margin: 0 0 0.5rem 0; font-weight: 700;'>📊 Technical Indicators</p>",
+        columns=3, cells=indicator_cells,
+    ), unsafe_allow_html=True)
     
     # Signal History Section
     st.markdown("---")
     st.markdown("### 📋 Recent Signal History")
     
     # Get recent signals from DataFrame
-    if 'final_buy' in df.columns and 'final_sell' in df.columns:
-        # Combine buy and sell signals with details
-        signal_history = []
-        
-        # Process recent data (last 50 candles)
-        recent_data = df.tail(50).copy()
-        
-        for idx, row in recent_data.iterrows():
-            signal_info = None
-            timestamp = row['timestamp']
-            price = row['close']
-            
-            # Check which signal triggered
-            if row.get('final_buy', False):
-                if row.get('wt_buy', False):
-                    signal_type = "WT Green Dot"
-                    priority = "Highest"
-                    color = "#00ff88"
-                elif row.get('momentum_buy', False):
-                    signal_type = "Momentum BUY"
-                    priority = "Medium"
-                    color = "#22cc88"
-                elif row.get('rsi_buy', False):
-                    signal_type = "RSI BUY"
-                    priority = "Low"
-                    color = "#88cc22"
-                else:
-                    signal_type = "BUY"
-                    priority = "Standard"
-                    color = "#22cc88"
-                
-                signal_info = {
-                    'time': timestamp,
-                    'signal': signal_type,
-                    'type': 'BUY',
-                    'price': price,
-                    'priority': priority,
-                    'color': color,
-                    'rsi': row.get('rsi', 0),
-                    'wt1': row.get('wt1', 0),
-                    'wt2': row.get('wt2', 0)
-                }
-                
-            elif row.get('final_sell', False):
-                if row.get('wt_sell', False):
-                    signal_type = "WT Red Dot"
-                    priority = "Highest"
-                    color = "#ff4444"
-                elif row.get('momentum_sell', False):
-                    signal_type = "Momentum SELL"
-                    priority = "Medium"
-                    color = "#cc2222"
-                elif row.get('rsi_sell', False):
-                    signal_type = "RSI SELL"
-                    priority = "Low"
-                    color = "#cc8822"
-                else:
-                    signal_type = "SELL"
-                    priority = "Standard"
-                    color = "#cc2222"
-                
-                signal_info = {
-                    'time': timestamp,
-                    'signal': signal_type,
-                    'type': 'SELL',
-                    'price': price,
-                    'priority': priority,
-                    'color': color,
-                    'rsi': row.get('rsi', 0),
-                    'wt1': row.get('wt1', 0),
-                    'wt2': row.get('wt2', 0)
-                }
-            
-            if signal_info:
-                signal_history.append(signal_info)
-        
-        if signal_history:
-            # Show last 10 signals
-            for sig in signal_history[-10:]:
-                time_str = sig['time'].strftime('%Y-%m-%d %H:%M:%S') if hasattr(sig['time'], 'strftime') else str(sig['time'])
-                
-                st.markdown(f"""
-                <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid {sig['color']};">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                        <span style="color: {sig['color']}; font-weight: 700; font-size: 1.1rem;">{sig['signal']}</span>
-                        <span style="color: var(--text-secondary); font-size: 0.85rem;">{time_str}</span>
-                    </div>
-                    <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; font-size: 0.85rem;">
-                        <div>
-                            <span style="color: var(--text-secondary);">Price:</span>
-                            <span style="color: var(--text-primary); font-weight: 600;">${float(sig['price']):,.4f}</span>
-                        </div>
-                        <div>
-                            <span style="color: var(--text-secondary);">Priority:</span>
-                            <span style="color: var(--text-primary); font-weight: 600;">{sig['priority']}</span>
-                        </div>
-                        <div>
-                            <span style="color: var(--text-secondary);">RSI:</span>
-                            <span style="color: var(--text-primary); font-weight: 600;">{float(sig['rsi']):.1f}</span>
-                        </div>
-                        <div>
-                            <span style="color: var(--text-secondary);">WT1/WT2:</span>
-                            <span style="color: var(--text-primary); font-weight: 600;">{float(sig['wt1']):.1f}/{float(sig['wt2']):.1f}</span>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+    if 'trigger_name' in df.columns:
+        # Signals among the last 50 candles
+        history_html = signal_history_html(df[['timestamp', 'close', 'trigger_name', 'rsi', 'wt1', 'wt2']].tail(50))
+        if history_html:
+            st.markdown(history_html, unsafe_allow_html=True)
         else:
             st.info("No signals generated in recent history")
     else:
@@ -2731,32 +2733,13 @@ with tabs[5]:
         """, unsafe_allow_html=True)
         
         try:
-            # Build simple exchanges map for scanner
-            import ccxt
-            ex_map = {}
-            ex_map['binance'] = ccxt.binance()
-            ex_map['bybit'] = ccxt.bybit()
-            ex_map['mexc'] = ccxt.mexc()
-            
-            scanner = ArbitrageEngine(ex_map, [symbol], threshold_bps=10.0)
-            opps = scanner.run_once()
+            opps = scan_arbitrage(ARB_EXCHANGES, symbol, 10.0)
             
             if opps:
-                for o in opps:
-                    st.markdown(f"""
-                    <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; 
-                                border: 1px solid var(--border-color); margin-bottom: 0.5rem;">
-                        <div style="color: var(--accent-green); font-weight: 600; margin-bottom: 0.5rem;">
-                            💰 Arbitrage Opportunity
-                        </div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">
-                            <strong>{o['symbol']}</strong><br/>
-                            Buy on: {o['buy_on']}<br/>
-                            Sell on: {o['sell_on']}<br/>
-                            Spread: <span style="color: var(--accent-green); font-weight: 600;">{o['spread']*100:.2f}%</span>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                st.markdown("".join(
+                    arb_opportunity_html(o['symbol'], o['buy_on'], o['sell_on'], round(float(o['spread']), 6))
+                    for o in opps
+                ), unsafe_allow_html=True)
             else:
                 st.markdown("""
                 <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; 
@@ -2800,53 +2783,47 @@ with tabs[6]:
             
             for order in real_orders:
                 order_id = order.get('orderId', 'Unknown')
-                symbol = order.get('symbol', 'Unknown')
-                side = order.get('side', 'Unknown')
-                qty = order.get('qty', 0)
-                price = order.get('price', 0)
-                status = order.get('orderStatus', 'Unknown')
-                
-                col1, col2, col3 = st.columns([3, 1, 1])
-                
-                with col1:
-                    st.markdown(f"""
-                    <div style="background: var(--card-bg); padding: 0.75rem; border-radius: 6px; margin: 0.5rem 0;">
-                        <div style="color: var(--text-primary); font-weight: 600;">{symbol} • {side}</div>
-                        <div style="color: var(--text-secondary); font-size: 0.9rem;">
-                            Qty: {qty} • Price: ${float(price):,.4f} • Status: {status}
-                        </div>
-                        <div style="color: var(--text-secondary); font-size: 0.8rem;">
-                            ID: {order_id}
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                order_symbol = order.get('symbol', 'Unknown')
                 
-                with col2:
-                    if st.button("❌ Cancel", key=f"cancel_{order_id}"):
-                        with st.spinner("Canceling order..."):
-                            try:
-                                result = _exec.cancel_order(order_id, symbol)
-                                if result.get('status') != 'error':
-                                    st.success(f"Order {order_id} canceled!")
-                                    # Refresh account data
-                                    account_data = _exec.get_account_info()
-                                    st.session_state['real_account_data'] = account_data
-                                    st.rerun()
-                                else:
-                                    st.error(f"Failed to cancel order: {result.get('error', 'Unknown error')}")
-                            except Exception as e:
-                                st.error(f"Error canceling order: {e}")
+                # Card and controls in one form: its buttons register as form submits
+                # and a click reruns the script once, whichever order it belongs to
+                with st.form(key=f"ord_{order_id}", border=False):
+                    col1, col2, col3 = st.columns([3, 1, 1])
+                    with col1:
+                        st.markdown(_ORDER_MANAGE_CARD.substitute(
+                            symbol=order_symbol,
+                            side=order.get('side', 'Unknown'),
+                            qty=order.get('qty', 0),
+                            price=f"{float(order.get('price', 0)):,.4f}",
+                            status=order.get('orderStatus', 'Unknown'),
+                            order_id=order_id,
+                        ), unsafe_allow_html=True)
+                    cancel = col2.form_submit_button("❌ Cancel")
+                    refresh = col3.form_submit_button("🔄 Refresh")
                 
-                with col3:
-                    if st.button("🔄 Refresh", key=f"refresh_{order_id}"):
-                        with st.spinner("Refreshing order data..."):
-                            try:
-                                account_data = _exec.get_account_info()
+                if cancel:
+                    with st.spinner("Canceling order..."):
+                        try:
+                            result = _exec.cancel_order(order_id, order_symbol)
+                            if result.get('status') != 'error':
+                                st.success(f"Order {order_id} canceled!")
+                                # Refresh account data
+                                account_data = fetch_account_info(_exec, ex_name, paper, refresh=True)
                                 st.session_state['real_account_data'] = account_data
-                                st.success("Order data refreshed!")
                                 st.rerun()
-                            except Exception as e:
-                                st.error(f"Error refreshing data: {e}")
+                            else:
+                                st.error(f"Failed to cancel order: {result.get('error', 'Unknown error')}")
+                        except Exception as e:
+                            st.error(f"Error canceling order: {e}")
+                elif refresh:
+                    with st.spinner("Refreshing order data..."):
+                        try:
+                            account_data = fetch_account_info(_exec, ex_name, paper, refresh=True)
+                            st.session_state['real_account_data'] = account_data
+                            st.success("Order data refreshed!")
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Error refreshing data: {e}")
         else:
             st.markdown("""
             <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; 
@@ -2895,7 +2872,7 @@ with tabs[6]:
                         if result.get('status') != 'error':
                             st.success(f"Order placed successfully! ID: {result.get('id', 'Unknown')}")
                             # Refresh account data
-                            account_data = _exec.get_account_info()
+                            account_data = fetch_account_info(_exec, ex_name, paper, refresh=True)
                             st.session_state['real_account_data'] = account_data
                             st.rerun()
                         else:
@@ -2906,10 +2883,10 @@ with tabs[6]:
                 st.error("Please fill in all required fields")
 
 with tabs[7]:
-    st.markdown('<div class="section-header">📊 Comprehensive Backtesting Metrics</div>', unsafe_allow_html=True)
+    section_header("📊 Comprehensive Backtesting Metrics")
     
     # Initialize metrics calculator
-    metrics_calculator = ComprehensiveMetricsCalculator()
+    metrics_calculator = _ComprehensiveMetricsCalculator()()
 
     # Enhanced Backtest Processing
     if st.session_state.get('enhanced_backtest_trigger'):
@@ -2918,8 +2895,7 @@ with tabs[7]:
         
         with st.spinner(f"Running enhanced backtest for {params.get('ticker', 'N/A')}..."):
             try:
-                # Initialize enhanced backtester
-                enhanced_bt = EnhancedBacktester()
+                enhanced_bt = get_enhanced_backtester()
                 
                 # Run enhanced backtest with new trading trigger system
                 bt_results = enhanced_bt.run_enhanced_backtest(
@@ -2948,9 +2924,11 @@ with tabs[7]:
                 # Extract equity curve for metrics
                 daily_summaries = bt_results.get('daily_summaries', [])
                 if daily_summaries:
-                    equity_curve = [ds['current_capital'] for ds in daily_summaries]
+                    equity_curve = np.fromiter(
+                        (ds['current_capital'] for ds in daily_summaries), dtype=np.float64, count=len(daily_summaries)
+                    )
                     st.session_state.setdefault('account', {'equity': []})
-                    st.session_state['account']['equity'] = equity_curve
+                    set_equity_history(st.session_state['account'], equity_curve)
                 
                 # Display quick summary
                 metrics = bt_results.get('metrics', {})
@@ -2971,16 +2949,17 @@ with tabs[7]:
         with st.spinner("Running backtest with current settings..."):
             try:
                 # Prepare data and signals for backtest
-                df_bt = df.copy() if 'df' in locals() else None
+                # The backtesters copy before writing, so df is passed as is; a new
+                # frame is only made when the signal column has to be added
+                df_bt = df if 'df' in locals() else None
                 if df_bt is not None and not df_bt.empty:
                     # Ensure a boolean entry signal column exists
                     if 'signal' not in df_bt.columns:
                         # Fallback: generate weighted signals if available
                         try:
-                            from indicators.weighted_signals import generate_weighted_signals
-                            df_bt['signal'] = generate_weighted_signals(df_bt).astype(bool)
+                            df_bt = df_bt.assign(signal=generate_weighted_signals(df_bt).astype(bool))
                         except Exception:
-                            df_bt['signal'] = False
+                            df_bt = df_bt.assign(signal=False)
                     # Run enhanced backtest if available, else core
                     try:
                         from backtester.enhanced_backtester import run_enhanced_backtest
@@ -2998,13 +2977,16 @@ with tabs[7]:
                             daily_pnl_limit=float(st.session_state.get('daily_loss_limit', -0.05)),
                         )
                     except Exception:
-                        from backtester.core import run_backtest as run_basic_backtest
-                        bt_res = run_basic_backtest(df_bt, entry_col='signal')
+                        bt_res = run_backtest(df_bt, entry_col='signal')
 
                     # Persist into session for metrics tab
                     st.session_state['trades'] = bt_res.get('trades', [])
                     st.session_state.setdefault('account', {'equity': []})
-                    st.session_state['account']['equity'] = bt_res.get('df', {}).get('equity', []) if isinstance(bt_res.get('df'), dict) else (bt_res.get('df')['equity'].tolist() if bt_res.get('df') is not None and 'equity' in bt_res.get('df').columns else st.session_state['account'].get('equity', []))
+                    bt_df = bt_res.get('df')
+                    if isinstance(bt_df, dict):
+                        set_equity_history(st.session_state['account'], bt_df.get('equity', []))
+                    elif bt_df is not None and 'equity' in bt_df.columns:
+                        set_equity_history(st.session_state['account'], bt_df['equity'].to_numpy())
                     st.success("Backtest completed. Open '📊 Comprehensive Backtesting Metrics' tab.")
                 else:
                     st.warning("No market data available to backtest. Load data first.")
@@ -3015,16 +2997,13 @@ with tabs[7]:
     if 'trades' in st.session_state and st.session_state['trades']:
         trades = st.session_state['trades']
         account = st.session_state.get('account', {'equity': [10000]})
-        equity_curve = pd.Series(account['equity'])
+        equity_curve = equity_history(account)
         
         # Calculate comprehensive metrics
         with st.spinner("Calculating comprehensive metrics..."):
             try:
-                metrics = metrics_calculator.calculate_comprehensive_metrics(
-                    equity_curve=equity_curve,
-                    trades=trades,
-                    initial_capital=initial_cap,
-                    risk_free_rate=0.02
+                metrics = comprehensive_metrics(
+                    equity_curve, trades, trades_fingerprint(trades), float(initial_cap)
                 )
                 
                 # Display metrics report
@@ -3080,7 +3059,7 @@ with tabs[7]:
         # Display timeframe configurations
         tf_df = pd.DataFrame(mtf_summary['timeframes'])
         st.markdown("**Timeframe Configuration:**")
-        st.markdown(tf_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+        st.markdown(frame_to_html(tf_df), unsafe_allow_html=True)
 
 with tabs[8]:
     # Advanced Backtester Tab
@@ -3240,7 +3219,6 @@ with tabs[8]:
                 try:
                     # Fetch data
                     if data_source == "Exchange API":
-                        from executor.ccxt_executor import CCXTExecutor
                         executor = CCXTExecutor(exchange_name=exchange_name, paper=True)
                         
                         # Calculate appropriate limit based on timeframe
@@ -3273,7 +3251,7 @@ with tabs[8]:
                         }
                         interval = tf_map.get(selected_timeframe, '1h')
                         
-                        df_backtest = yf.download(yf_symbol, period=period, interval=interval, progress=False)
+                        df_backtest = _yf().download(yf_symbol, period=period, interval=interval, progress=False)
                         if not df_backtest.empty:
                             df_backtest = df_backtest.reset_index()
                             df_backtest.columns = [col if col != 'Datetime' else 'timestamp' for col in df_backtest.columns]
@@ -3296,7 +3274,6 @@ with tabs[8]:
                         df_backtest[['wt1', 'wt2']] = wt_result
                         
                         # Generate signals
-                        from signals.engine import align_signals
                         df_backtest['signal'] = align_signals(
                             df_backtest,
                             rsi_col='rsi',
@@ -3308,7 +3285,6 @@ with tabs[8]:
                         )
                         
                         # Run backtest
-                        from backtester.core import run_backtest
                         bt_results = run_backtest(
                             df_backtest,
                             entry_col='signal',
@@ -3524,7 +3500,7 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Auto-refresh logic
-if st.session_state['is_trading']:
+# Auto-refresh logic (only needed when the browser-side timer is unavailable)
+if st.session_state['is_trading'] and st_autorefresh is None:
     time.sleep(int(refresh_secs))
     st.rerun()
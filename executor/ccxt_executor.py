@@ -39,6 +39,9 @@ class CCXTExecutor:
             self._configure_exchange()
         
         self.markets_loaded = False
+        # Listings are semi-static per exchange; memoized per instance (empty results are not kept)
+        self._symbols_cache: Dict[str, List[str]] = {}
+        self._timeframes_cache: List[str] = []
 
     def _configure_exchange(self):
         """Configure exchange-specific settings"""
@@ -107,6 +110,14 @@ class CCXTExecutor:
                 self.markets_loaded = False
 
     def list_symbols(self, quote_filter: str = 'USDT') -> List[str]:
+        cached = self._symbols_cache.get(quote_filter)
+        if cached is None:
+            cached = self._fetch_symbols(quote_filter)
+            if cached:
+                self._symbols_cache[quote_filter] = cached
+        return list(cached)
+
+    def _fetch_symbols(self, quote_filter: str) -> List[str]:
         if self.exchange_name.lower() == 'bybit':
             # Use Bybit v5 data fetcher
             symbols = self.bybit_data.get_symbols(quote_filter)
@@ -137,6 +148,11 @@ class CCXTExecutor:
             return []
 
     def list_timeframes(self) -> List[str]:
+        if not self._timeframes_cache:
+            self._timeframes_cache = self._fetch_timeframes()
+        return list(self._timeframes_cache)
+
+    def _fetch_timeframes(self) -> List[str]:
         if self.exchange_name.lower() == 'bybit':
             # Use Bybit v5 timeframes
             return self.bybit_data.get_timeframes()
@@ -614,6 +630,8 @@ class CCXTExecutor:
             }
         
         try:
+            # Sequential on purpose: the calls share one sync ccxt client, which is
+            # not thread-safe (shared session, strictly increasing nonce)
             return {
                 'balance': self.fetch_balance(),
                 'positions': self.fetch_positions(),
@@ -5,11 +5,12 @@ This module provides technical analysis indicators for trading signals.
 
 COMPONENTS:
 - indicators/rsi.py: Relative Strength Index (RSI)
+- indicators/ema.py: Exponential Moving Average (EMA)
 - indicators/wavetrend.py: WaveTrend oscillator
 - indicators/weighted_signals.py: Weighted signal generator
 
 Usage:
-    from indicators.rsi import rsi
+    from indicators.rsi import rsi, rsi_ema_multi
     from indicators.wavetrend import wavetrend
     from indicators.weighted_signals import WeightedSignalGenerator
     
@@ -19,8 +20,16 @@ Usage:
     # Calculate WaveTrend
     df[['wt1', 'wt2']] = wavetrend(df['hlc3'], channel_length=10, average_length=21)
     
+    # Hot paths can skip pandas: ndarray in, ndarray out
+    rsi_values = rsi(df['close'].to_numpy(), length=14)
+    
+    # RSI and the chart EMAs from a single pass over close
+    rsi_values, emas = rsi_ema_multi(df['close'].to_numpy(), length=14, ema_lengths=(20, 50, 200))
+    
     # Generate weighted signals
     generator = WeightedSignalGenerator(rsi_weight=0.4, wavetrend_weight=0.4, buy_sell_weight=0.2)
     signals = generator.generate_weighted_signal(df)
 """
 
+# Optional-numba shim, shared with kernels that live outside this package
+from indicators._kernels import NUMBA_AVAILABLE, njit
@@ -0,0 +1,126 @@
+"""
+Shared numeric kernels for the indicators package.
+
+Numba is optional: when it is installed the kernels are compiled with
+@njit(cache=True), otherwise `njit` is a no-op and callers fall back to the
+pandas implementation for anything that would be slow as a plain Python loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator used when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _ewm_update(avg, old_wt, cur, alpha):
+    """One step of the `adjust=False` EWM recursion; returns the new (avg, old_wt) state."""
+    if avg == avg:
+        old_wt *= 1.0 - alpha
+        if cur == cur:
+            avg = (old_wt * avg + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif cur == cur:
+        avg = cur
+    return avg, old_wt
+
+
+@njit(cache=True)
+def _ewm_mean_kernel(x, alpha):
+    """Recursive EWM mean with pandas `adjust=False` semantics (NaNs carried, not skipped)."""
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+    avg = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        avg, old_wt = _ewm_update(avg, old_wt, x[i], alpha)
+        out[i] = avg
+    return out
+
+
+@njit(cache=True)
+def _ewm_mean_multi_kernel(x, alphas):
+    """_ewm_mean_kernel for several alphas at once, in a single pass over x."""
+    n = len(x)
+    k = len(alphas)
+    out = np.empty((n, k), dtype=np.float64)
+    avg = np.full(k, np.nan)
+    old_wt = np.ones(k)
+    for i in range(n):
+        cur = x[i]
+        for j in range(k):
+            avg[j], old_wt[j] = _ewm_update(avg[j], old_wt[j], cur, alphas[j])
+            out[i, j] = avg[j]
+    return out
+
+
+@njit(cache=True)
+def _rsi_ema_multi_kernel(x, rsi_alpha, ema_alphas):
+    """
+    Wilder RSI (column 0) and several EMAs (columns 1..k) from a single pass over x.
+    Matches rsi() and _ewm_mean_multi_kernel step for step, NaNs included.
+    """
+    n = len(x)
+    k = len(ema_alphas)
+    out = np.empty((n, k + 1), dtype=np.float64)
+    ma_up = ma_down = np.nan
+    up_wt = down_wt = 1.0
+    avg = np.full(k, np.nan)
+    old_wt = np.ones(k)
+    prev = np.nan
+    for i in range(n):
+        cur = x[i]
+        delta = cur - prev
+        if delta == delta:
+            up = delta if delta > 0.0 else 0.0
+            down = -delta if delta < 0.0 else 0.0
+        else:
+            up = down = np.nan
+        ma_up, up_wt = _ewm_update(ma_up, up_wt, up, rsi_alpha)
+        ma_down, down_wt = _ewm_update(ma_down, down_wt, down, rsi_alpha)
+        rs = ma_up / (ma_down if ma_down != 0 else 1e-10)
+        out[i, 0] = 100 - (100 / (1 + rs))
+        for j in range(k):
+            avg[j], old_wt[j] = _ewm_update(avg[j], old_wt[j], cur, ema_alphas[j])
+            out[i, j + 1] = avg[j]
+        prev = cur
+    return out
+
+
+def ewm_mean(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Equivalent of `pd.Series(x).ewm(alpha=alpha, adjust=False).mean()` on a float64 array.
+    Uses the compiled kernel when numba is available, pandas otherwise.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _ewm_mean_kernel(x, float(alpha))
+    return pd.Series(x).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA with pandas `ewm(span=span, adjust=False)` semantics."""
+    return ewm_mean(x, 2.0 / (span + 1.0))
+
+
+def ema_multi(x: np.ndarray, spans) -> np.ndarray:
+    """EMAs for several spans in one pass; returns an (n, len(spans)) array, one column per span."""
+    x = np.asarray(x, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        alphas = np.array([2.0 / (span + 1.0) for span in spans], dtype=np.float64)
+        return _ewm_mean_multi_kernel(x, alphas)
+    s = pd.Series(x)
+    return np.column_stack([s.ewm(span=span, adjust=False).mean().to_numpy() for span in spans])
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from ._kernels import ema as _ema, ema_multi as _ema_multi
+
+
+def ema(close, length: int):
+    """
+    Exponential moving average, equivalent to `close.ewm(span=length, adjust=False).mean()`.
+    Accepts a Series (returns a Series on the same index) or a float ndarray (returns an ndarray).
+    """
+    out = _ema(np.asarray(close, dtype=np.float64), length)
+    if isinstance(close, pd.Series):
+        return pd.Series(out, index=close.index, name=close.name)
+    return out
+
+
+def ema_multi(close, lengths):
+    """
+    Several EMAs from one pass over close (e.g. 20/50/200 for the chart).
+    Returns an (n, len(lengths)) ndarray, one column per length.
+    """
+    return _ema_multi(np.asarray(close, dtype=np.float64), tuple(lengths))
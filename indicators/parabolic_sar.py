@@ -1,94 +1,90 @@
 import pandas as pd
 import numpy as np
 
-def parabolic_sar(high: pd.Series, low: pd.Series, close: pd.Series, 
-                  af_start: float = 0.02, af_increment: float = 0.02, 
-                  af_max: float = 0.2) -> pd.Series:
-    """
-    Calculate Parabolic SAR (Stop and Reverse)
-    
-    Args:
-        high: High prices series
-        low: Low prices series
-        close: Close prices series
-        af_start: Acceleration factor start (default: 0.02)
-        af_increment: Acceleration factor increment (default: 0.02)
-        af_max: Acceleration factor maximum (default: 0.2)
-    
-    Returns:
-        Parabolic SAR values as Series
-    """
-    sar = pd.Series(index=high.index, dtype=float)
-    trend = pd.Series(index=high.index, dtype=int)  # 1 for uptrend, -1 for downtrend
-    ep = pd.Series(index=high.index, dtype=float)  # Extreme point
-    af = pd.Series(index=high.index, dtype=float)  # Acceleration factor
+from ._kernels import njit
+
+
+# Eager signature: compiled (or loaded from the on-disk cache) at import, so the first
+# chart render does not pay JIT latency. No fastmath: it would change NaN comparisons.
+@njit("float64[:](float64[:], float64[:], float64[:], float64, float64, float64)", cache=True)
+def _psar_kernel(h, l, c, af_start, af_increment, af_max):
+    """Parabolic SAR over float64 arrays (compiled when numba is available)."""
+    n = len(h)
+    sar = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return sar
     
-    # Initialize first values
-    sar.iloc[0] = low.iloc[0]
-    trend.iloc[0] = 1  # Start in uptrend
-    ep.iloc[0] = high.iloc[0]
-    af.iloc[0] = af_start
+    # Trend state is carried in scalars: 1 for uptrend, -1 for downtrend,
+    # ep is the extreme point and af the acceleration factor
+    sar[0] = l[0]
+    trend = 1  # Start in uptrend
+    ep = h[0]
+    af = af_start
     
     # Calculate SAR for each bar
-    for i in range(1, len(high)):
-        prev_sar = sar.iloc[i-1]
-        prev_trend = trend.iloc[i-1]
-        prev_ep = ep.iloc[i-1]
-        prev_af = af.iloc[i-1]
+    for i in range(1, n):
+        prev_sar = sar[i-1]
         
         # Calculate SAR for current bar based on previous trend
-        if prev_trend == 1:
-            # Uptrend SAR calculation
-            current_sar = prev_sar + prev_af * (prev_ep - prev_sar)
+        current_sar = prev_sar + af * (ep - prev_sar)
+        if trend == 1:
             # SAR cannot be above low of previous bar
-            current_sar = min(current_sar, low.iloc[i-1])
+            current_sar = min(current_sar, l[i-1])
             
             # Check for trend reversal
-            if close.iloc[i] < current_sar:
+            if c[i] < current_sar:
                 # Trend reverses to downtrend
-                current_sar = prev_ep
-                trend.iloc[i] = -1
-                ep.iloc[i] = low.iloc[i]
-                af.iloc[i] = af_start
-            else:
-                # Continue uptrend
-                trend.iloc[i] = 1
-                # Update extreme point
-                if high.iloc[i] > prev_ep:
-                    ep.iloc[i] = high.iloc[i]
-                    # Increase acceleration factor
-                    new_af = prev_af + af_increment
-                    af.iloc[i] = min(new_af, af_max)
-                else:
-                    ep.iloc[i] = prev_ep
-                    af.iloc[i] = prev_af
+                current_sar = ep
+                trend = -1
+                ep = l[i]
+                af = af_start
+            elif h[i] > ep:
+                # Continue uptrend with a new extreme point
+                ep = h[i]
+                af = min(af + af_increment, af_max)
         else:
-            # Downtrend SAR calculation
-            current_sar = prev_sar + prev_af * (prev_ep - prev_sar)
             # SAR cannot be below high of previous bar
-            current_sar = max(current_sar, high.iloc[i-1])
+            current_sar = max(current_sar, h[i-1])
             
             # Check for trend reversal
-            if close.iloc[i] > current_sar:
+            if c[i] > current_sar:
                 # Trend reverses to uptrend
-                current_sar = prev_ep
-                trend.iloc[i] = 1
-                ep.iloc[i] = high.iloc[i]
-                af.iloc[i] = af_start
-            else:
-                # Continue downtrend
-                trend.iloc[i] = -1
-                # Update extreme point
-                if low.iloc[i] < prev_ep:
-                    ep.iloc[i] = low.iloc[i]
-                    # Increase acceleration factor
-                    new_af = prev_af + af_increment
-                    af.iloc[i] = min(new_af, af_max)
-                else:
-                    ep.iloc[i] = prev_ep
-                    af.iloc[i] = prev_af
+                current_sar = ep
+                trend = 1
+                ep = h[i]
+                af = af_start
+            elif l[i] < ep:
+                # Continue downtrend with a new extreme point
+                ep = l[i]
+                af = min(af + af_increment, af_max)
         
-        sar.iloc[i] = current_sar
+        sar[i] = current_sar
     
     return sar
 
+
+def parabolic_sar(high, low, close, 
+                  af_start: float = 0.02, af_increment: float = 0.02, 
+                  af_max: float = 0.2):
+    """
+    Calculate Parabolic SAR (Stop and Reverse)
+    
+    Args:
+        high: High prices (Series or ndarray)
+        low: Low prices (Series or ndarray)
+        close: Close prices (Series or ndarray)
+        af_start: Acceleration factor start (default: 0.02)
+        af_increment: Acceleration factor increment (default: 0.02)
+        af_max: Acceleration factor maximum (default: 0.2)
+    
+    Returns:
+        Parabolic SAR values, as a Series when high is a Series, else an ndarray
+    """
+    # The kernel signature takes writeable float64 arrays; np.require copies only if needed
+    sar = _psar_kernel(
+        np.require(high, np.float64, 'W'), np.require(low, np.float64, 'W'), np.require(close, np.float64, 'W'),
+        float(af_start), float(af_increment), float(af_max)
+    )
+    if isinstance(high, pd.Series):
+        return pd.Series(sar, index=high.index)
+    return sar
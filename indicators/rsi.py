@@ -1,12 +1,37 @@
+import numpy as np
 import pandas as pd
 
-def rsi(close: pd.Series, length: int = 14) -> pd.Series:
-    """Return RSI series using Wilder's smoothing."""
-    delta = close.diff()
-    up = delta.clip(lower=0)
-    down = -1 * delta.clip(upper=0)
-    ma_up = up.ewm(alpha=1/length, adjust=False).mean()
-    ma_down = down.ewm(alpha=1/length, adjust=False).mean()
-    rs = ma_up / (ma_down.replace(0, 1e-10))
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+from ._kernels import NUMBA_AVAILABLE, _rsi_ema_multi_kernel, ema_multi, ewm_mean
+
+
+def rsi(close, length: int = 14):
+    """
+    Return RSI using Wilder's smoothing.
+    Accepts a Series (returns a Series on the same index) or a float ndarray (returns an ndarray).
+    """
+    x = np.asarray(close, dtype=np.float64)
+    delta = np.empty_like(x)
+    delta[:1] = np.nan
+    delta[1:] = np.diff(x)
+    up = np.clip(delta, 0, None)
+    down = -np.clip(delta, None, 0)
+    ma_up = ewm_mean(up, 1 / length)
+    ma_down = ewm_mean(down, 1 / length)
+    rs = ma_up / np.where(ma_down == 0, 1e-10, ma_down)
+    out = 100 - (100 / (1 + rs))
+    if isinstance(close, pd.Series):
+        return pd.Series(out, index=close.index, name=close.name)
+    return out
+
+
+def rsi_ema_multi(close, length: int = 14, ema_lengths=(20, 50, 200)):
+    """
+    RSI plus several EMAs of the same close array, computed in one compiled pass when
+    numba is available. Returns (rsi, emas) ndarrays, emas shaped (n, len(ema_lengths)).
+    """
+    x = np.asarray(close, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        alphas = np.array([2.0 / (span + 1.0) for span in ema_lengths], dtype=np.float64)
+        out = _rsi_ema_multi_kernel(x, 1.0 / length, alphas)
+        return out[:, 0], out[:, 1:]
+    return rsi(x, length), ema_multi(x, tuple(ema_lengths))
@@ -1,23 +1,40 @@
+import warnings
+
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _rolling_extreme(x: np.ndarray, length: int, reducer) -> np.ndarray:
+    """Trailing-window nan-aware min/max with pandas `min_periods=1` semantics."""
+    if len(x) == 0:
+        return x.copy()
+    padded = np.concatenate((np.full(length - 1, np.nan), x))
+    with warnings.catch_warnings():
+        # all-NaN windows yield NaN, same as pandas
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return reducer(sliding_window_view(padded, length), axis=1)
 
-def stochastic(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
+
+def stochastic(high, low, close, length: int = 14):
     """
     Calculate Stochastic Oscillator (%K line)
     
     Args:
-        high: High prices series
-        low: Low prices series
-        close: Close prices series
+        high: High prices (Series or ndarray)
+        low: Low prices (Series or ndarray)
+        close: Close prices (Series or ndarray)
         length: Period for calculation (default: 14)
     
     Returns:
-        Stochastic %K values as Series
+        Stochastic %K values, as a Series when close is a Series, else an ndarray
     """
-    lowest_low = low.rolling(window=length, min_periods=1).min()
-    highest_high = high.rolling(window=length, min_periods=1).max()
+    c = np.asarray(close, dtype=np.float64)
+    lowest_low = _rolling_extreme(np.asarray(low, dtype=np.float64), length, np.nanmin)
+    highest_high = _rolling_extreme(np.asarray(high, dtype=np.float64), length, np.nanmax)
     
-    stoch_k = 100 * ((close - lowest_low) / (highest_high - lowest_low + 1e-10))
+    stoch_k = 100 * ((c - lowest_low) / (highest_high - lowest_low + 1e-10))
     
+    if isinstance(close, pd.Series):
+        return pd.Series(stoch_k, index=close.index)
     return stoch_k
-
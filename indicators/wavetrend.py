@@ -1,10 +1,46 @@
+import numpy as np
 import pandas as pd
 
-def wavetrend(hlc3: pd.Series, channel_length: int = 10, average_length: int = 21) -> pd.DataFrame:
-    """Simplified WaveTrend implementation returning wt1 and wt2."""
-    esa = hlc3.ewm(span=channel_length, adjust=False).mean()
-    de = (hlc3 - esa).abs().ewm(span=channel_length, adjust=False).mean()
-    ci = (hlc3 - esa) / (0.015 * de.replace(0, 1e-10))
-    wt1 = ci.ewm(span=average_length, adjust=False).mean()
-    wt2 = wt1.ewm(span=4, adjust=False).mean()
-    return pd.DataFrame({"wt1": wt1, "wt2": wt2})
+from ._kernels import NUMBA_AVAILABLE, _ewm_update, ema, njit
+
+
+@njit(cache=True)
+def _wavetrend_kernel(x, channel_length, average_length):
+    """esa, de, ci, wt1 and wt2 in a single pass over hlc3 (compiled when numba is available)."""
+    n = len(x)
+    wt1 = np.empty(n, dtype=np.float64)
+    wt2 = np.empty(n, dtype=np.float64)
+    a_ch = 2.0 / (channel_length + 1.0)
+    a_avg = 2.0 / (average_length + 1.0)
+    a_sig = 2.0 / (4 + 1.0)
+    esa = de = w1 = w2 = np.nan
+    esa_wt = de_wt = w1_wt = w2_wt = 1.0
+    for i in range(n):
+        cur = x[i]
+        esa, esa_wt = _ewm_update(esa, esa_wt, cur, a_ch)
+        de, de_wt = _ewm_update(de, de_wt, abs(cur - esa), a_ch)
+        ci = (cur - esa) / (0.015 * (de if de != 0 else 1e-10))
+        w1, w1_wt = _ewm_update(w1, w1_wt, ci, a_avg)
+        w2, w2_wt = _ewm_update(w2, w2_wt, w1, a_sig)
+        wt1[i] = w1
+        wt2[i] = w2
+    return wt1, wt2
+
+
+def wavetrend(hlc3, channel_length: int = 10, average_length: int = 21):
+    """
+    Simplified WaveTrend implementation returning wt1 and wt2.
+    A Series input returns a DataFrame with wt1/wt2 columns; an ndarray input returns a (wt1, wt2) tuple.
+    """
+    x = np.asarray(hlc3, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        wt1, wt2 = _wavetrend_kernel(x, float(channel_length), float(average_length))
+    else:
+        esa = ema(x, channel_length)
+        de = ema(np.abs(x - esa), channel_length)
+        ci = (x - esa) / (0.015 * np.where(de == 0, 1e-10, de))
+        wt1 = ema(ci, average_length)
+        wt2 = ema(wt1, 4)
+    if isinstance(hlc3, pd.Series):
+        return pd.DataFrame({"wt1": wt1, "wt2": wt2}, index=hlc3.index)
+    return wt1, wt2
@@ -17,7 +17,9 @@ Related systems:
 - strategies/client_weighted.py: Strategy-specific weights
 """
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 # alignment policy: all three sources must agree within ±1 candle index
 def align_signals(
@@ -32,33 +34,29 @@ def align_signals(
     alignment_window: int = 1,
 ) -> pd.Series:
     n = len(df)
-    out = [False] * n
+    window = int(alignment_window)
+    if n == 0 or window < 0:
+        return pd.Series(False, index=df.index)
 
-    def rsi_buy_at(idx):
-        return float(df[rsi_col].iat[idx]) < float(rsi_oversold_threshold)
+    if enable_rsi_gate:
+        rsi_ok = df[rsi_col].to_numpy(dtype=float) < float(rsi_oversold_threshold)
+    else:
+        rsi_ok = np.ones(n, dtype=bool)
 
-    def wt_cross_up(idx):
-        if idx == 0:
-            return False
-        return (
-            df[wt1_col].iat[idx-1] <= df[wt2_col].iat[idx-1]
-            and df[wt1_col].iat[idx] > df[wt2_col].iat[idx]
-        )
+    # wt1 crosses above wt2 at bar j (never on the first bar)
+    wt1 = df[wt1_col].to_numpy(dtype=float)
+    wt2 = df[wt2_col].to_numpy(dtype=float)
+    cross_up = np.zeros(n, dtype=bool)
+    cross_up[1:] = (wt1[:-1] <= wt2[:-1]) & (wt1[1:] > wt2[1:])
 
-    for i in range(n):
-        # allow configurable ±window bars alignment
-        for j in range(i - int(alignment_window), i + int(alignment_window) + 1):
-            if j < 0 or j >= n:
-                continue
-            if require_webhook:
-                webhook_series = df.get(webhook_col, pd.Series([False] * n, index=df.index))
-                webhook_ok = bool(webhook_series.iat[j])
-            else:
-                webhook_ok = True
-            rsi_ok = rsi_buy_at(j) if enable_rsi_gate else True
-            if rsi_ok and wt_cross_up(j) and webhook_ok:
-                out[i] = True
-                break
+    if require_webhook and webhook_col in df.columns:
+        webhook_ok = df[webhook_col].to_numpy(dtype=bool)
+    else:
+        webhook_ok = np.full(n, not require_webhook)
+
+    # bar i fires if any bar within ±window satisfies all three conditions
+    hits = np.pad(rsi_ok & cross_up & webhook_ok, window)
+    out = sliding_window_view(hits, 2 * window + 1).any(axis=1)
     return pd.Series(out, index=df.index)
 
 def wt_cross_down(df: pd.DataFrame, wt1_col: str = 'wt1', wt2_col: str = 'wt2') -> pd.Series:
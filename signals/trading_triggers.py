@@ -101,7 +101,9 @@ class TradingTriggerEngine:
         # Check if webhook column exists, otherwise create empty signals
         if 'webhook' in df.columns:
             # Use webhook signals directly
-            momentum_buy = df['webhook'].astype(bool)
+            momentum_buy = df['webhook']
+            if momentum_buy.dtype != bool:
+                momentum_buy = momentum_buy.astype(bool)
             momentum_sell = pd.Series(False, index=df.index)  # Webhook only provides buy signals typically
         else:
             # Fallback: No webhook signals available
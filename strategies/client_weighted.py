@@ -19,14 +19,39 @@ Related systems:
 - signals/engine.py: Multi-source alignment
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional
 
 from strategies.base import Strategy
+from indicators import NUMBA_AVAILABLE, njit
 from indicators.rsi import rsi as rsi_calc
 from indicators.wavetrend import wavetrend
 
 
+@njit(cache=True)
+def _weighted_buy_kernel(tv_flags, tv_weights, rsi_vals, rsi_threshold, wt1, wt2,
+                         weight_tv, weight_rsi, weight_wt, entry_threshold):
+    """
+    Per-bar weighted BUY score against entry_threshold, in one pass.
+    tv_flags is (n, m) with NaN meaning "no alert"; the WT cross-up needs the previous bar.
+    """
+    n = len(rsi_vals)
+    out = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        tv = 0.0
+        for j in range(tv_flags.shape[1]):
+            flag = tv_flags[i, j]
+            if flag == flag:
+                tv += flag * tv_weights[j]
+        rsi_flag = 1.0 if rsi_vals[i] >= rsi_threshold else 0.0
+        wt_flag = 0.0
+        if i > 0 and wt1[i - 1] <= wt2[i - 1] and wt1[i] > wt2[i]:
+            wt_flag = 1.0
+        out[i] = weight_tv * tv + weight_rsi * rsi_flag + weight_wt * wt_flag >= entry_threshold
+    return out
+
+
 class ClientWeightedStrategy(Strategy):
     """
     Client-weighted strategy combining:
@@ -59,50 +84,46 @@ class ClientWeightedStrategy(Strategy):
         # Optional multi-timeframe TV weights: dict of column->weight, e.g. {"tv_buy_5m":0.15, "tv_buy_15m":0.25}
         mtf_tv_weights: Optional[dict] = None,
     ) -> pd.Series:
-        data = df.copy()
-
-        # TradingView buy flag (0/1) — supports multi-timeframe aggregation if columns present
-        tv_score = pd.Series(0.0, index=data.index)
-        # primary single TF flag
-        if 'tv_buy' in data.columns:
-            tv_score = tv_score.add(data['tv_buy'].astype(float).fillna(0.0), fill_value=0.0)
-        # optional multi-timeframe flags like tv_buy_5m, tv_buy_15m etc.
+        # TradingView buy flags — primary single TF 'tv_buy' (weight 1) plus optional
+        # multi-timeframe flags like tv_buy_5m, tv_buy_15m with their configured weights
+        tv_cols = ['tv_buy'] if 'tv_buy' in df.columns else []
+        tv_weights = [1.0] * len(tv_cols)
         if mtf_tv_weights:
             for col, w in mtf_tv_weights.items():
-                if col in data.columns and w:
-                    tv_score = tv_score.add(data[col].astype(float).fillna(0.0) * float(w), fill_value=0.0)
-        data['tv_buy_flag'] = tv_score
-
-        # RSI compute and map to 0/1 buy
-        data['rsi_val'] = rsi_calc(data['close'], length=int(rsi_length))
-        data['rsi_buy_flag'] = (data['rsi_val'] >= float(rsi_buy_threshold)).astype(float)
-
-        # WaveTrend cross-up detection (green dot)
-        if set(['high','low','close']).issubset(data.columns):
-            wt_input = (data['high'] + data['low'] + data['close']) / 3.0
+                if col in df.columns and w:
+                    tv_cols.append(col)
+                    tv_weights.append(float(w))
+        if tv_cols:
+            tv_flags = df[tv_cols].to_numpy(dtype=np.float64)
         else:
-            wt_input = data['close']
-        wt_df = wavetrend(wt_input, channel_length=int(wt_channel_length), average_length=int(wt_average_length))
-        if isinstance(wt_df, pd.DataFrame):
-            data['wt1'] = wt_df['wt1']
-            data['wt2'] = wt_df['wt2']
+            tv_flags = np.empty((len(df), 0), dtype=np.float64)
+        tv_weights = np.array(tv_weights, dtype=np.float64)
+
+        # RSI and WaveTrend on raw arrays
+        close = df['close'].to_numpy(dtype=np.float64)
+        rsi_vals = rsi_calc(close, length=int(rsi_length))
+        if set(['high','low','close']).issubset(df.columns):
+            wt_input = (df['high'].to_numpy(dtype=np.float64) + df['low'].to_numpy(dtype=np.float64) + close) / 3.0
         else:
-            # Handle tuple/list
-            data['wt1'], data['wt2'] = wt_df
-        data['wt_buy_flag'] = ((data['wt1'].shift(1) <= data['wt2'].shift(1)) & (data['wt1'] > data['wt2'])).astype(float)
-
-        # Weighted score for BUY
-        data['score_buy'] = (
-            weight_tv * data['tv_buy_flag'] +
-            weight_rsi * data['rsi_buy_flag'] +
-            weight_wt * data['wt_buy_flag']
-        )
-
-        data['final_buy'] = data['score_buy'] >= float(entry_threshold)
+            wt_input = close
+        wt1, wt2 = wavetrend(wt_input, channel_length=int(wt_channel_length), average_length=int(wt_average_length))
+
+        if NUMBA_AVAILABLE:
+            signal = _weighted_buy_kernel(
+                tv_flags, tv_weights, rsi_vals, float(rsi_buy_threshold), wt1, wt2,
+                float(weight_tv), float(weight_rsi), float(weight_wt), float(entry_threshold),
+            )
+        else:
+            tv_score = np.zeros(len(df))
+            for j in range(tv_flags.shape[1]):
+                tv_score += np.nan_to_num(tv_flags[:, j]) * tv_weights[j]
+            rsi_flag = (rsi_vals >= float(rsi_buy_threshold)).astype(float)
+            wt_flag = np.zeros(len(df))
+            wt_flag[1:] = (wt1[:-1] <= wt2[:-1]) & (wt1[1:] > wt2[1:])
+            score = weight_tv * tv_score + weight_rsi * rsi_flag + weight_wt * wt_flag
+            signal = score >= float(entry_threshold)
 
         # For compatibility: return a boolean 'signal' series (buy-only)
-        signal = data['final_buy'].fillna(False).astype(bool)
-        signal.name = 'signal'
-        return signal
+        return pd.Series(signal, index=df.index, name='signal')
 
 
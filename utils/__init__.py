@@ -4,7 +4,7 @@ Utils Module - Supporting Utilities
 This module provides utilities for risk management, logging, metrics, and helpers.
 
 RISK MANAGEMENT HIERARCHY:
-- utils/risk.py: Simple helper functions (position sizing, SL/TP)
+- utils/risk.py: Simple helper functions (position sizing, SL/TP, exit check)
 - utils/advanced_risk.py: AdvancedRiskManager - Base class with TP1/TP2/Runner, daily breaker
 - utils/configurable_risk.py: ConfigurableRiskManager - Extends AdvancedRiskManager with multiple stop-loss methods
 
@@ -0,0 +1,80 @@
+"""
+HTML cards rendered many times per session (signal history, arbitrage scanner).
+
+They live here rather than in app.py because Streamlit runs the main script in
+a fresh module on every rerun, which would rebuild a cache defined there. This
+module is imported once per process, so the per-card memo survives reruns.
+"""
+
+import string
+from functools import lru_cache
+
+_SIGNAL_HISTORY_CARD = string.Template("""
+                <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid $color;">
+                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+                        <span style="color: $color; font-weight: 700; font-size: 1.1rem;">$signal</span>
+                        <span style="color: var(--text-secondary); font-size: 0.85rem;">$time_str</span>
+                    </div>
+                    <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; font-size: 0.85rem;">
+                        <div>
+                            <span style="color: var(--text-secondary);">Price:</span>
+                            <span style="color: var(--text-primary); font-weight: 600;">$$$price</span>
+                        </div>
+                        <div>
+                            <span style="color: var(--text-secondary);">Priority:</span>
+                            <span style="color: var(--text-primary); font-weight: 600;">$priority</span>
+                        </div>
+                        <div>
+                            <span style="color: var(--text-secondary);">RSI:</span>
+                            <span style="color: var(--text-primary); font-weight: 600;">$rsi</span>
+                        </div>
+                        <div>
+                            <span style="color: var(--text-secondary);">WT1/WT2:</span>
+                            <span style="color: var(--text-primary); font-weight: 600;">$wt1/$wt2</span>
+                        </div>
+                    </div>
+                </div>
+""")
+
+_ARB_OPPORTUNITY_CARD = string.Template("""
+                    <div style="background: var(--card-bg); padding: 1rem; border-radius: 8px; 
+                                border: 1px solid var(--border-color); margin-bottom: 0.5rem;">
+                        <div style="color: var(--accent-green); font-weight: 600; margin-bottom: 0.5rem;">
+                            💰 Arbitrage Opportunity
+                        </div>
+                        <div style="color: var(--text-secondary); font-size: 0.9rem;">
+                            <strong>$symbol</strong><br/>
+                            Buy on: $buy_on<br/>
+                            Sell on: $sell_on<br/>
+                            Spread: <span style="color: var(--accent-green); font-weight: 600;">$spread%</span>
+                        </div>
+                    </div>
+""")
+
+
+@lru_cache(maxsize=512)
+def signal_card_html(signal: str, description: str, color: str, time_str: str,
+                     price: float, rsi: float, wt1: float, wt2: float) -> str:
+    """
+    One signal-history card; description/color come from the trigger's badge.
+    Memoized per signal, so when a new bar shifts the history only the new card
+    is rendered.
+    """
+    return _SIGNAL_HISTORY_CARD.substitute(
+        color=color,
+        signal=signal,
+        time_str=time_str,
+        price=f"{price:,.4f}",
+        priority=description.replace(" Priority", "") or "Standard",
+        rsi=f"{rsi:.1f}",
+        wt1=f"{wt1:.1f}",
+        wt2=f"{wt2:.1f}",
+    )
+
+
+@lru_cache(maxsize=256)
+def arb_opportunity_html(symbol: str, buy_on: str, sell_on: str, spread: float) -> str:
+    """One arbitrage opportunity card (spread as a fraction), memoized per opportunity."""
+    return _ARB_OPPORTUNITY_CARD.substitute(
+        symbol=symbol, buy_on=buy_on, sell_on=sell_on, spread=f"{spread*100:.2f}",
+    )
@@ -11,6 +11,8 @@ from plotly.subplots import make_subplots
 def create_premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = False) -> go.Figure:
     """
     Create upgraded TradingView-style chart with professional UI and full zoom/pan support.
+    Full-length indicator lines use WebGL (Scattergl); candles and the sparse signal
+    markers stay on SVG.
     """
     rows = 4 if show_volume else 3
 
@@ -53,7 +55,7 @@ def create_premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = Fals
     ):
         if ema in df.columns:
             fig.add_trace(
-                go.Scatter(
+                go.Scattergl(
                     x=df["timestamp"],
                     y=df[ema],
                     name=name,
@@ -66,7 +68,7 @@ def create_premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = Fals
 
     # WaveTrend
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df["timestamp"],
             y=df["wt1"],
             name="WT1",
@@ -77,7 +79,7 @@ def create_premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = Fals
         col=1,
     )
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df["timestamp"],
             y=df["wt2"],
             name="WT2",
@@ -95,7 +97,7 @@ def create_premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = Fals
 
     # RSI and Stoch
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df["timestamp"],
             y=df["rsi"],
             name="RSI",
@@ -107,7 +109,7 @@ def create_premium_chart(df: pd.DataFrame, symbol: str, show_volume: bool = Fals
         col=1,
     )
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df["timestamp"],
             y=df["stoch"],
             name="Stochastic %K",
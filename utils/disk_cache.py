@@ -0,0 +1,67 @@
+"""
+Small on-disk cache for computed DataFrames.
+
+Frames are pickled under .cache/<namespace>/ keyed by a hash of the caller's key
+parts plus the numpy/pandas/numba versions, so an upgrade never serves a frame
+written by an older stack. The cache is best effort: any read or write failure
+behaves like a miss.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+    _NUMBA_VERSION = numba.__version__
+except ImportError:
+    _NUMBA_VERSION = None
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+
+_LIBRARY_VERSIONS = (np.__version__, pd.__version__, _NUMBA_VERSION)
+
+
+def cache_key(*parts) -> str:
+    """Stable hex key for the given parts (their repr) and the library versions."""
+    return hashlib.sha1(repr((parts, _LIBRARY_VERSIONS)).encode("utf-8")).hexdigest()
+
+
+def _path(namespace: str, key: str) -> str:
+    return os.path.join(CACHE_DIR, namespace, f"{key}.pkl")
+
+
+def load_frame(namespace: str, key: str) -> Optional[pd.DataFrame]:
+    """Return the stored frame, or None on a miss or an unreadable entry."""
+    path = _path(namespace, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception:
+        return None
+
+
+def store_frame(namespace: str, key: str, df: pd.DataFrame, max_entries: int = 256) -> None:
+    """Write df atomically and keep at most max_entries files in the namespace (oldest dropped)."""
+    directory = os.path.join(CACHE_DIR, namespace)
+    path = _path(namespace, key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+        entries = [e for e in os.scandir(directory) if e.name.endswith(".pkl")]
+        if len(entries) > max_entries:
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:len(entries) - max_entries]:
+                os.remove(entry.path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -1,22 +1,62 @@
 import os
 import csv
+import time
+import atexit
+import threading
+from collections import deque
 from datetime import datetime
 
+# Equity rows are appended in batches: a file is written once PNL_BATCH_ROWS rows
+# are queued or PNL_FLUSH_SECS have passed since its last write (a timer covers
+# the case where no further row arrives), and at exit. While a file cannot be
+# written its rows stay queued, up to PNL_MAX_PENDING; older rows beyond that are
+# dropped and counted (see pnl_rows_dropped).
+PNL_BATCH_ROWS = 64
+PNL_FLUSH_SECS = 30.0
+PNL_MAX_PENDING = 10000
+
+# A file whose write failed is not tried again for LOG_RETRY_SECS, so a full or
+# read-only disk costs one failed write per window rather than one per call.
+LOG_RETRY_SECS = 30.0
+
+_pnl_lock = threading.Lock()
+_pnl_pending = {}
+_pnl_last_flush = {}
+_pnl_timers = {}
+_pnl_dropped = {}
+_log_retry_at = {}
+
 
 def _ensure_dir(path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
 
-def log_trade(file_path: str, record: dict):
-    _ensure_dir(file_path)
-    exists = os.path.exists(file_path)
+def _log_writable(file_path: str) -> bool:
+    return time.monotonic() >= _log_retry_at.get(file_path, 0.0)
+
+
+def _log_failed(file_path: str, error: Exception):
+    _log_retry_at[file_path] = time.monotonic() + LOG_RETRY_SECS
+    print(f"LOG_WRITE_FAILED {file_path}: {error} (retrying in {LOG_RETRY_SECS:.0f}s)")
+
+
+def log_trade(file_path: str, record: dict) -> bool:
+    """Append record to the trade CSV; False if it was not written (see LOG_RETRY_SECS)."""
+    if not _log_writable(file_path):
+        return False
     # Add mode and timestamp
     record['log_timestamp'] = datetime.utcnow().isoformat()
-    with open(file_path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=sorted(record.keys()))
-        if not exists:
-            writer.writeheader()
-        writer.writerow(record)
+    try:
+        _ensure_dir(file_path)
+        exists = os.path.exists(file_path)
+        with open(file_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=sorted(record.keys()))
+            if not exists:
+                writer.writeheader()
+            writer.writerow(record)
+    except Exception as e:
+        _log_failed(file_path, e)
+        return False
     
     # Mode-specific console logging with exchange info
     exchange = record.get('exchange', 'Unknown')
@@ -24,15 +64,74 @@ def log_trade(file_path: str, record: dict):
         print(f"PAPER_TRADE_LOGGED on {exchange}: {record}")
     else:
         print(f"REAL_TRADE_LOGGED on {exchange}: {record}")
+    return True
+
+
+def _write_pnl_rows(file_path: str):
+    """
+    Append the queued rows for file_path in one open/write (caller holds _pnl_lock).
+    Rows that fail to write stay queued for the next attempt after LOG_RETRY_SECS.
+    """
+    rows = _pnl_pending.get(file_path)
+    _pnl_last_flush[file_path] = time.monotonic()
+    if not rows or not _log_writable(file_path):
+        return
+    try:
+        _ensure_dir(file_path)
+        exists = os.path.exists(file_path)
+        with open(file_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['ts','equity'])
+            if not exists:
+                writer.writeheader()
+            writer.writerows(rows)
+    except Exception as e:
+        _log_failed(file_path, e)
+        return
+    rows.clear()
+
+
+def _schedule_pnl_flush(file_path: str):
+    """Arm a one-shot flush of file_path's queued rows (caller holds _pnl_lock)."""
+    if not _pnl_pending.get(file_path) or file_path in _pnl_timers:
+        return
+    timer = threading.Timer(PNL_FLUSH_SECS, _timed_pnl_flush, args=(file_path,))
+    timer.daemon = True
+    _pnl_timers[file_path] = timer
+    timer.start()
+
+
+def _timed_pnl_flush(file_path: str):
+    with _pnl_lock:
+        _pnl_timers.pop(file_path, None)
+        _write_pnl_rows(file_path)
+        _schedule_pnl_flush(file_path)
+
+
+def log_pnl(file_path: str, equity: float, flush: bool = False):
+    """Queue an equity row (timestamped now); see PNL_BATCH_ROWS / PNL_FLUSH_SECS."""
+    with _pnl_lock:
+        rows = _pnl_pending.setdefault(file_path, deque(maxlen=PNL_MAX_PENDING))
+        if len(rows) == PNL_MAX_PENDING:
+            dropped = _pnl_dropped[file_path] = _pnl_dropped.get(file_path, 0) + 1
+            if dropped == 1:
+                print(f"PNL_ROWS_DROPPED {file_path}: queue full ({PNL_MAX_PENDING} rows), dropping oldest")
+        rows.append({'ts': datetime.utcnow().isoformat(), 'equity': float(equity)})
+        due = time.monotonic() - _pnl_last_flush.get(file_path, float('-inf')) >= PNL_FLUSH_SECS
+        if flush or due or len(rows) >= PNL_BATCH_ROWS:
+            _write_pnl_rows(file_path)
+        _schedule_pnl_flush(file_path)
+
+
+def pnl_rows_dropped(file_path: str) -> int:
+    """Number of equity rows for file_path dropped because its queue was full."""
+    return _pnl_dropped.get(file_path, 0)
 
 
-def log_pnl(file_path: str, equity: float):
-    _ensure_dir(file_path)
-    exists = os.path.exists(file_path)
-    with open(file_path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['ts','equity'])
-        if not exists:
-            writer.writeheader()
-        writer.writerow({'ts': datetime.utcnow().isoformat(), 'equity': float(equity)})
+@atexit.register
+def flush_pnl():
+    """Write every queued equity row (call when trading stops or a position closes)."""
+    with _pnl_lock:
+        for file_path in list(_pnl_pending):
+            _write_pnl_rows(file_path)
 
 
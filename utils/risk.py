@@ -16,3 +16,16 @@ def apply_sl_tp(entry_price: float, price: float, stop_loss_pct: float, take_pro
     return False
 
 
+def exit_levels(entry_price: float, stop_loss_pct: float, take_profit_pct: float, max_bars_in_trade: int) -> dict:
+    """Exit parameters fixed when a position opens: stop/take-profit prices and the bar limit."""
+    return {
+        'stop_price': entry_price * (1 - float(stop_loss_pct)),
+        'tp_price': entry_price * (1 + float(take_profit_pct)),
+        'max_bars': int(max_bars_in_trade),
+    }
+
+
+def should_exit_position(price: float, stop_price: float, tp_price: float, bars_in_trade: int, max_bars: int,
+                         wt_cross_down: bool = False) -> bool:
+    """Exit on stop-loss/take-profit, a WaveTrend cross-down, or after max_bars bars."""
+    return price <= stop_price or price >= tp_price or wt_cross_down or bars_in_trade >= max_bars
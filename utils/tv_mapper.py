@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
 def to_yfinance_symbol(exchange: str, symbol: str) -> str:
     """
     Map exchange+symbol to a yfinance-friendly ticker for overlay charts.
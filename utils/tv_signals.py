@@ -8,6 +8,11 @@ import requests
 from .tv_mapper import to_yfinance_symbol
 
 
+def _parse_signal_time(values: pd.Series) -> pd.Series:
+    """Parse webhook times ('time' is TradingView ISO 8601, 'received_at' is isoformat()) as UTC."""
+    return pd.to_datetime(values, format="ISO8601", utc=True, cache=True)
+
+
 def load_tradingview_signals(store_path: str = "logs/tv_signals.jsonl", symbol: Optional[str] = None) -> pd.DataFrame:
     """
     Load TradingView signals that were stored by the webhook server.
@@ -36,7 +41,7 @@ def load_tradingview_signals(store_path: str = "logs/tv_signals.jsonl", symbol:
     # Harmonize timestamp column
     ts_col = "time" if "time" in df.columns else ("received_at" if "received_at" in df.columns else None)
     if ts_col:
-        df["timestamp"] = pd.to_datetime(df[ts_col])
+        df["timestamp"] = _parse_signal_time(df[ts_col])
     else:
         df["timestamp"] = pd.NaT
 
@@ -70,9 +75,9 @@ def fetch_recent_signals_http(base_url: str = "http://localhost:8001", symbol: O
             return pd.DataFrame()
         df = pd.DataFrame(items)
         if 'time' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['time'])
+            df['timestamp'] = _parse_signal_time(df['time'])
         elif 'received_at' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['received_at'])
+            df['timestamp'] = _parse_signal_time(df['received_at'])
         df = _expand_extra(df)
         return df.sort_values('timestamp').reset_index(drop=True)
     except Exception: